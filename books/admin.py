@@ -14,12 +14,13 @@ class BookAdmin(admin.ModelAdmin):
         "published_date",
         "display_cover_thumbnail",
     )
-    list_filter = ("author", "published_date")
+    list_filter = ("author", "published_date", "enrichment_status")
     search_fields = ("title", "author", "isbn", "description")
     readonly_fields = (
         "created_at",
         "updated_at",
         "enriched_data",
+        "enrichment_status",
         "display_cover",
         "display_enriched_info",
     )
@@ -136,7 +137,12 @@ class BookAdmin(admin.ModelAdmin):
         (
             "Technical Data",
             {
-                "fields": ("enriched_data", "created_at", "updated_at"),
+                "fields": (
+                    "enriched_data",
+                    "enrichment_status",
+                    "created_at",
+                    "updated_at",
+                ),
                 "classes": ("collapse",),
             },
         ),
@@ -0,0 +1,116 @@
+"""
+Async read endpoints for ASGI deployments.
+
+DRF views are synchronous, so under ASGI each request holds a thread for its
+whole duration. These views serve the same list and detail representations
+as `BookViewSet` (query parameters, filters, pagination and authentication
+included) with Django's async ORM, so a worker can serve many of them
+concurrently on one event loop.
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from .renderers import FastJSONRenderer
+from .serializers import BookRowSerializer
+from .views import BookViewSet
+
+
+def _json_response(data: Any, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        status=status_code,
+        content_type=FastJSONRenderer.media_type,
+    )
+
+
+def _exception_response(
+    view: BookViewSet, request: Request, exc: exceptions.APIException
+) -> HttpResponse:
+    """Builds the same error response as DRF's exception handler."""
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        auth_header = view.get_authenticate_header(request)
+        if not auth_header:
+            exc.status_code = status.HTTP_403_FORBIDDEN
+    else:
+        auth_header = None
+
+    data = (
+        exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    )
+    response = _json_response(data, exc.status_code)
+    if auth_header:
+        response["WWW-Authenticate"] = auth_header
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+async def _dispatch(
+    request: Any,
+    action: str,
+    handler: Callable[[BookViewSet, Request], Awaitable[Any]],
+    **kwargs,
+) -> HttpResponse:
+    """
+    Runs `handler` with a `BookViewSet` set up as DRF would for `action`.
+
+    Authentication and throttling (which do I/O) run in a thread; the
+    permission checks and the handler run on the event loop.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    view = BookViewSet(action_map={"get": action}, args=(), kwargs=kwargs)
+    view.format_kwarg = None
+    view.request = drf_request = view.initialize_request(request)
+    try:
+        await sync_to_async(view.perform_authentication)(drf_request)
+        view.check_permissions(drf_request)
+        await sync_to_async(view.check_throttles)(drf_request)
+        data = await handler(view, drf_request)
+    except exceptions.APIException as exc:
+        return _exception_response(view, drf_request, exc)
+    return _json_response(data)
+
+
+async def _list(view: BookViewSet, request: Request) -> Dict[str, Any]:
+    serializer = BookRowSerializer(view.get_requested_fields())
+    queryset = view.filter_queryset(view.get_queryset()).values(
+        *set(serializer.fields) | set(view.always_loaded_fields)
+    )
+    rows = await view.paginator.apaginate_queryset(queryset, request, view=view)
+    return view.paginator.get_paginated_response(serializer.serialize(rows)).data
+
+
+async def _retrieve(view: BookViewSet, request: Request) -> Dict[str, Any]:
+    serializer = BookRowSerializer(view.get_requested_fields())
+    row = (
+        await view.get_queryset()
+        .values(*serializer.fields)
+        .filter(pk=view.kwargs["pk"])
+        .afirst()
+    )
+    if row is None:
+        raise exceptions.NotFound()
+    if view.uses_object_permissions():
+        # Loads the Book and checks the object-level permissions on it
+        try:
+            await sync_to_async(view.get_object)()
+        except Http404:
+            raise exceptions.NotFound()
+    return serializer.to_representation(row)
+
+
+async def book_list(request: Any) -> HttpResponse:
+    """Async `GET /api/async/books/`, equivalent to the books list."""
+    return await _dispatch(request, "list", _list)
+
+
+async def book_detail(request: Any, pk: int) -> HttpResponse:
+    """Async `GET /api/async/books/{id}/`, equivalent to the book detail."""
+    return await _dispatch(request, "retrieve", _retrieve, pk=pk)
@@ -0,0 +1,64 @@
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from ..models import Book
+from ..services import get_collection_version
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+def representation_digest(request: Any) -> str:
+    """
+    Hashes everything besides the data that shapes a response body.
+
+    Query parameters are sorted so equivalent URLs share a digest. The Accept
+    header is included since it selects the renderer.
+    """
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    raw = f"{urlencode(params)}|{request.META.get('HTTP_ACCEPT', '')}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _book_updated_at(request: Any, pk: Any) -> Optional[datetime]:
+    """Loads only the book's `updated_at`, once per request."""
+    updated_at = getattr(request, "_book_updated_at", _UNSET)
+    if updated_at is _UNSET:
+        try:
+            updated_at = (
+                Book.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+            )
+        except (TypeError, ValueError):
+            updated_at = None
+        request._book_updated_at = updated_at
+    return updated_at
+
+
+def book_etag(request: Any, pk: Any = None, **kwargs) -> Optional[str]:
+    """Strong ETag of a book, changing whenever the book is saved."""
+    updated_at = _book_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return f"book-{pk}-{updated_at.timestamp():.6f}-{representation_digest(request)}"
+
+
+def book_last_modified(request: Any, pk: Any = None, **kwargs) -> Optional[datetime]:
+    return _book_updated_at(request, pk)
+
+
+def collection_etag(request: Any, **kwargs) -> Optional[str]:
+    """Strong ETag of a list page, changing whenever any book changes."""
+    try:
+        version = get_collection_version()
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+        return None
+    return f"books-{version}-{representation_digest(request)}"
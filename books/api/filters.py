@@ -0,0 +1,85 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class EnrichedDataFilter(BaseFilterBackend):
+    """
+    Filters books on their Google Books attributes.
+
+    Categories, language and publisher become a single JSON containment
+    condition (`enriched_data @> {...}`), served by the GIN index on
+    `enriched_data`. Rating and page count ranges use the extracted
+    `enriched_average_rating` and `enriched_page_count` columns and their
+    btree indexes.
+
+    Only applied to the actions listed in the view's `filter_actions`.
+    """
+
+    # Query parameter -> (column, lookup, parser)
+    range_params: Dict[str, Any] = {
+        "rating_min": ("enriched_average_rating", "gte", float),
+        "rating_max": ("enriched_average_rating", "lte", float),
+        "pages_min": ("enriched_page_count", "gte", int),
+        "pages_max": ("enriched_page_count", "lte", int),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action not in getattr(view, "filter_actions", ()):
+            return queryset
+
+        params = request.query_params
+        document: Dict[str, Any] = {}
+        categories = self._split(params.get("categories"))
+        if categories:
+            document["categories"] = categories
+        for name in ("language", "publisher"):
+            if params.get(name):
+                document[name] = params[name]
+        if document:
+            queryset = queryset.filter(enriched_data__contains=document)
+
+        for param, (column, lookup, parser) in self.range_params.items():
+            value = self._parse(params, param, parser)
+            if value is not None:
+                queryset = queryset.filter(**{f"{column}__{lookup}": value})
+        return queryset
+
+    def get_schema_operation_parameters(self, view) -> List[dict]:
+        def parameter(name: str, kind: str, description: str) -> dict:
+            return {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": kind},
+            }
+
+        return [
+            parameter(
+                "categories",
+                "string",
+                "Comma-separated categories the book must all have, e.g. `Fiction`.",
+            ),
+            parameter("language", "string", "Language code, e.g. `en`."),
+            parameter("publisher", "string", "Exact publisher name."),
+            parameter("rating_min", "number", "Minimum average rating."),
+            parameter("rating_max", "number", "Maximum average rating."),
+            parameter("pages_min", "integer", "Minimum page count."),
+            parameter("pages_max", "integer", "Maximum page count."),
+        ]
+
+    @staticmethod
+    def _split(value: Optional[str]) -> List[str]:
+        return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+    @staticmethod
+    def _parse(params: Any, name: str, parser: Callable[[str], Any]) -> Any:
+        raw = params.get(name)
+        if raw in (None, ""):
+            return None
+        try:
+            return parser(raw)
+        except ValueError:
+            raise ValidationError({name: "Must be a number."})
@@ -0,0 +1,179 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BookPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Page numbers need a `COUNT(*)` and an `OFFSET` scan, which get slower the
+    deeper the page. Passing `?pagination=cursor` (or following a `cursor`
+    link) instead seeks directly to the position after the previous page using
+    the `(created_at, id)` index, so every page costs the same and no count is
+    executed.
+    """
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self._init_mode(request, view):
+            return super().paginate_queryset(queryset, request, view)
+
+        queryset = self._seek(queryset, request)
+        # Fetch one extra row to know whether another page follows.
+        return self._cursor_page(list(queryset[: self.cursor_page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` for async views, using the async ORM."""
+        if self._init_mode(request, view):
+            queryset = self._seek(queryset, request)
+            rows = [row async for row in queryset[: self.cursor_page_size + 1]]
+            return self._cursor_page(rows)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return [row async for row in queryset]
+
+        self.request = request
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Set the cached property so the paginator never counts synchronously.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom : bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        return rows
+
+    def _init_mode(self, request, view) -> bool:
+        """Records and returns whether the request uses keyset pagination."""
+        # Keyset pagination relies on the default (created_at, id) ordering,
+        # so views ordering results differently (e.g. by rank) use page numbers.
+        self.use_cursor = getattr(view, "cursor_pagination", True) and (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+        return self.use_cursor
+
+    def _seek(self, queryset, request):
+        """Filters and orders the queryset to the rows following the cursor."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor_page_size = self.get_page_size(request)
+        created_at, pk, reverse = self._decode_cursor(request)
+        self.cursor_position = created_at
+        self.cursor_reverse = reverse
+
+        if created_at is None:
+            queryset = queryset.order_by("-created_at", "-id")
+        elif reverse:
+            # Rows before the cursor, nearest first; flipped back below.
+            queryset = queryset.filter(
+                Q(created_at__gte=created_at)
+                & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+            ).order_by("created_at", "id")
+        else:
+            queryset = queryset.filter(
+                Q(created_at__lte=created_at)
+                & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+            ).order_by("-created_at", "-id")
+        return queryset
+
+    def _cursor_page(self, rows: List[Any]) -> List[Any]:
+        """Trims the extra row fetched by `_seek` and records the page links."""
+        has_more = len(rows) > self.cursor_page_size
+        rows = rows[: self.cursor_page_size]
+        if self.cursor_reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor_position is not None
+
+        self.page_rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.page_rows[0], reverse=True)
+
+    def get_schema_operation_parameters(self, view) -> List[dict]:
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` to use keyset pagination.",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque position returned in `next`/`previous` links.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+    def _link(self, row: Any, reverse: bool) -> str:
+        # Rows are model instances or `.values()` dicts.
+        if isinstance(row, dict):
+            position = [row["created_at"].isoformat(), row["id"], reverse]
+        else:
+            position = [row.created_at.isoformat(), row.pk, reverse]
+        cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        url = remove_query_param(self.base_url, self.page_query_param)
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def _decode_cursor(self, request) -> Tuple[Any, Optional[int], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+        try:
+            created_at, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded))
+            created_at = parse_datetime(created_at)
+            if created_at is None:
+                raise ValueError(created_at)
+            return created_at, int(pk), bool(reverse)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List
+
+import orjson
+from asgiref.sync import sync_to_async
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, with the same output as DRF's.
+
+    Compact, non-indented output is produced by orjson; pretty-printed output
+    (`indent` media type parameter or browsable API) and anything orjson
+    cannot encode fall back to the stdlib implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as DRF, keeping the output a strict JavaScript subset
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class StreamingRenderer(BaseRenderer, ABC):
+    """
+    Renderer producing a response body row by row.
+
+    Besides the usual `render`, subclasses implement `stream`, which yields
+    the body in chunks so exports can be sent with a `StreamingHttpResponse`
+    without building the whole document in memory.
+    """
+
+    @abstractmethod
+    def stream(self, rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator:
+        """Yields the body for `rows`, restricted to `fields`, as strings."""
+
+    def stream_chunks(
+        self, rows: Iterable[Dict[str, Any]], fields: List[str], size: int = 65536
+    ) -> Iterator[bytes]:
+        """Groups the output of `stream` into encoded chunks of about `size` bytes."""
+        parts, length = [], 0
+        for part in self.stream(rows, fields):
+            parts.append(part)
+            length += len(part)
+            if length >= size:
+                yield "".join(parts).encode(self.charset)
+                parts, length = [], 0
+        if parts:
+            yield "".join(parts).encode(self.charset)
+
+    async def astream_chunks(
+        self, rows: Iterable[Dict[str, Any]], fields: List[str], size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """
+        Async version of `stream_chunks`, for responses served under ASGI.
+
+        Django reads a synchronous streaming body whole before sending it under
+        ASGI. Here each chunk is produced in the request's sync thread (where
+        the database cursor lives), so memory stays constant.
+        """
+        chunks = self.stream_chunks(rows, fields, size)
+        next_chunk = sync_to_async(next)
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return "".join(self.stream(rows, fields)).encode(self.charset)
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Newline-delimited JSON: one object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def stream(self, rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator:
+        encoder = JSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode({name: row[name] for name in fields}) + "\n"
+
+
+class JSONArrayRenderer(StreamingRenderer):
+    """A JSON array of objects, written one element at a time."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = "utf-8"
+
+    def stream(self, rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator:
+        encoder = JSONEncoder(ensure_ascii=False)
+        separator = "["
+        for row in rows:
+            yield separator + encoder.encode({name: row[name] for name in fields})
+            separator = ",\n"
+        yield "[]" if separator == "[" else "]\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Error responses keep their usual shape instead of becoming an array
+        if data is None or isinstance(data, list):
+            return super().render(data, accepted_media_type, renderer_context)
+        return JSONEncoder(ensure_ascii=False).encode(data).encode(self.charset)
+
+
+class CSVRenderer(StreamingRenderer):
+    """Comma-separated values with a header row. JSON columns are embedded as JSON."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def stream(self, rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        encoder = JSONEncoder(ensure_ascii=False)
+
+        def flush() -> str:
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        writer.writerow(fields)
+        yield flush()
+        for row in rows:
+            writer.writerow([self._cell(row[name], encoder) for name in fields])
+            yield flush()
+
+    @staticmethod
+    def _cell(value: Any, encoder: json.JSONEncoder) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, (str, int, float)):
+            return value
+        if isinstance(value, (dict, list)):
+            return encoder.encode(value)
+        # Dates and datetimes, formatted as in the JSON API
+        return encoder.default(value)
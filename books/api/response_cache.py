@@ -0,0 +1,84 @@
+import functools
+import logging
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..services import get_collection_version
+from ..services.metrics import Counter
+from .conditional import representation_digest
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "books_response_cache_requests_total",
+    "API response cache lookups by endpoint and result (hit, miss, error).",
+    ["endpoint", "result"],
+)
+
+
+def response_cache_key(request: Any, endpoint: str, version: int) -> str:
+    """
+    Builds the cache key of a response.
+
+    The key embeds the collection version, so bumping the version invalidates
+    every cached response at once. The host and scheme are included because
+    pagination links are absolute.
+    """
+    origin = f"{request.scheme}://{request.get_host()}"
+    path = request.path
+    return (
+        f"responses:{version}:{endpoint}:{origin}{path}:"
+        f"{representation_digest(request)}"
+    )
+
+
+def cache_response(endpoint: str) -> Callable:
+    """
+    Caches the data of successful responses of a viewset read action.
+
+    Only the serialized data is stored, not the rendered body, so each hit is
+    still rendered for the requesting user and content type. Disabled when
+    `RESPONSE_CACHE_TTL` is 0, and when the view checks object-level
+    permissions, since cached data is shared by every user.
+
+    Args:
+        endpoint: Name used in cache keys and metrics, e.g. `list`
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(view: Any, request: Any, *args, **kwargs) -> Response:
+            timeout = getattr(settings, "RESPONSE_CACHE_TTL", 60)
+            if not timeout or view.uses_object_permissions():
+                return handler(view, request, *args, **kwargs)
+
+            try:
+                # Read the version first: a write racing with this request then
+                # bumps it past the key the response is stored under.
+                key = response_cache_key(request, endpoint, get_collection_version())
+                data = cache.get(key)
+            except Exception as e:
+                logger.error(f"Cache error: {str(e)}", exc_info=True)
+                RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result="error")
+                return handler(view, request, *args, **kwargs)
+
+            if data is not None:
+                RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+                return Response(data)
+
+            RESPONSE_CACHE_REQUESTS.inc(endpoint=endpoint, result="miss")
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                try:
+                    cache.set(key, response.data, timeout=timeout)
+                except Exception as e:
+                    logger.error(f"Cache error: {str(e)}", exc_info=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,9 +1,36 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.core.validators import MinLengthValidator
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 
 from ..models import Book
 
 
 class BookSerializer(serializers.ModelSerializer):
+    """
+    Book representation.
+
+    Pass `fields` to render only a subset of the fields (sparse fieldsets).
+    """
+
+    # Compact representation used by default on list responses
+    SUMMARY_FIELDS = [
+        "id",
+        "title",
+        "author",
+        "isbn",
+        "published_date",
+        "enrichment_status",
+    ]
+
+    def __init__(self, *args, fields: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Book
         fields = [
@@ -16,8 +43,15 @@ class BookSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "enriched_data",
+            "enrichment_status",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "enriched_data",
+            "enrichment_status",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "enriched_data"]
 
     def validate_isbn(self, value: str) -> str:
         """
@@ -31,3 +65,88 @@ class BookSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("ISBN must be 10 or 13 digits long.")
 
         return isbn
+
+
+class BookUpsertSerializer(BookSerializer):
+    """
+    Validates books sent to the bulk upsert endpoint.
+
+    Existing ISBNs are allowed, since they identify the books to update.
+    """
+
+    class Meta(BookSerializer.Meta):
+        extra_kwargs = {"isbn": {"validators": [MinLengthValidator(10)]}}
+
+    def validate_items(
+        self, items: List[Any]
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, Any]]:
+        """
+        Validates each item on its own, so one bad book does not reject the rest.
+
+        Returns:
+            Tuple of the valid `(index, data)` pairs and the errors by index
+        """
+        valid, errors = [], {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors[index] = {"non_field_errors": ["Expected an object."]}
+                continue
+            try:
+                valid.append((index, self.run_validation(item)))
+            except serializers.ValidationError as e:
+                errors[index] = e.detail
+        return valid, errors
+
+
+def _datetime_formatter(tz: Any) -> Callable[[Any], Any]:
+    """Formats datetimes in `tz` like DRF's `DateTimeField` with default settings."""
+
+    def format_datetime(value: Any) -> Any:
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def _format_date(value: Any) -> Any:
+    return None if value is None else value.isoformat()
+
+
+class BookRowSerializer:
+    """
+    Read-only fast path rendering `.values()` rows like `BookSerializer`.
+
+    Building a `ModelSerializer` and converting every value through its field
+    objects dominates CPU on large lists. This serializer only formats the
+    columns whose JSON form differs from the database value (dates and
+    datetimes), and keeps `BookSerializer`'s field order, so its output is
+    identical.
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None) -> None:
+        requested = set(BookSerializer.Meta.fields if fields is None else fields)
+        self.fields = [name for name in BookSerializer.Meta.fields if name in requested]
+        self.converters = []
+        # Resolved once: looking up the active timezone is slow in a hot loop.
+        format_datetime = _datetime_formatter(timezone.get_current_timezone())
+        for name in self.fields:
+            field = Book._meta.get_field(name)
+            if isinstance(field, models.DateTimeField):
+                self.converters.append((name, format_datetime))
+            elif isinstance(field, models.DateField):
+                self.converters.append((name, _format_date))
+
+    def to_representation(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        data = {name: row[name] for name in self.fields}
+        for name, convert in self.converters:
+            data[name] = convert(data[name])
+        return data
+
+    def serialize(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.to_representation(row) for row in rows]
@@ -1,11 +1,16 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import BookViewSet
+from .async_views import book_detail, book_list
+from .views import BookViewSet, metrics
 
 router = DefaultRouter()
 router.register(r"books", BookViewSet)
 
 urlpatterns = [
+    path("metrics", metrics, name="metrics"),
+    # Async read endpoints, for ASGI deployments
+    path("async/books/", book_list, name="async-book-list"),
+    path("async/books/<int:pk>/", book_detail, name="async-book-detail"),
     path("", include(router.urls)),
 ]
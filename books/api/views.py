@@ -1,14 +1,54 @@
-from typing import Any
+from typing import Any, Dict, List, Optional
 
-from django.shortcuts import get_object_or_404, render
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_GET
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 
 from ..models import Book
-from ..services import BookEnrichmentService
-from .serializers import BookSerializer
+from ..services import (
+    INTERACTIVE,
+    BookEnrichmentService,
+    enqueue_enrichment,
+    enrichment_priority,
+    get_suggestions,
+    invalidate_book_info,
+    upsert_books,
+)
+from ..services.metrics import render_metrics
+from .conditional import book_etag, book_last_modified, collection_etag
+from .filters import EnrichedDataFilter
+from .pagination import BookPagination
+from .renderers import CSVRenderer, JSONArrayRenderer, NDJSONRenderer
+from .response_cache import cache_response
+from .serializers import BookRowSerializer, BookSerializer, BookUpsertSerializer
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Comma-separated fields to return, e.g. `id,title,isbn`.",
+    ),
+    OpenApiParameter(
+        "exclude", str, description="Comma-separated fields to leave out."
+    ),
+    OpenApiParameter(
+        "view",
+        str,
+        enum=["summary", "full"],
+        description="Base representation. Lists default to `summary`.",
+    ),
+]
 
 
 @extend_schema(tags=["books"])
@@ -22,18 +62,126 @@ class BookViewSet(viewsets.ModelViewSet):
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    pagination_class = BookPagination
+    filter_backends = [EnrichedDataFilter]
+
+    # Read actions supporting `?fields=`, `?exclude=` and `?view=`
+    fieldset_actions = {"list", "retrieve", "search", "batch", "export"}
+    # Actions accepting the enriched data filters
+    filter_actions = {"list", "search", "export"}
+    # Throttle scopes of actions other than plain reads and writes
+    throttle_scopes = {"refresh_enriched_data": "refreshes"}
+    # Columns always loaded since pagination orders on them
+    always_loaded_fields = ["id", "created_at"]
+
+    def uses_object_permissions(self) -> bool:
+        """
+        Returns whether any permission class implements object-level checks.
+
+        Reads served from `.values()` rows have no Book to check, so they
+        only load one when this is true.
+        """
+        return any(
+            type(permission).has_object_permission
+            is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def get_requested_fields(self) -> Optional[List[str]]:
+        """
+        Resolves the fields to render from the query parameters.
+
+        Returns None when the action does not support sparse fieldsets.
+        """
+        if self.action not in self.fieldset_actions:
+            return None
+
+        params = self.request.query_params
+        available = BookSerializer.Meta.fields
+        default_view = "summary" if self.action in ("list", "search") else "full"
+        view = params.get("view", default_view)
+        if view not in ("summary", "full"):
+            raise ValidationError({"view": "Must be `summary` or `full`."})
+
+        if params.get("fields"):
+            fields = self._parse_field_list("fields")
+        elif view == "summary":
+            fields = list(BookSerializer.SUMMARY_FIELDS)
+        else:
+            fields = list(available)
+
+        excluded = set(self._parse_field_list("exclude"))
+        return [name for name in fields if name not in excluded]
+
+    def _parse_field_list(self, param: str) -> List[str]:
+        names = [
+            name.strip()
+            for name in self.request.query_params.get(param, "").split(",")
+            if name.strip()
+        ]
+        unknown = sorted(set(names) - set(BookSerializer.Meta.fields))
+        if unknown:
+            raise ValidationError(
+                {
+                    param: f"Unknown field(s): {', '.join(unknown)}. Available: "
+                    f"{', '.join(BookSerializer.Meta.fields)}."
+                }
+            )
+        return names
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is not None:
+            # Never fetch columns that will not be rendered.
+            queryset = queryset.only(*set(fields) | set(self.always_loaded_fields))
+        return queryset
+
+    @property
+    def cursor_pagination(self) -> bool:
+        # Search results are ordered by rank, not by (created_at, id).
+        return self.action != "search"
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
 
     @extend_schema(
         summary="List all books",
-        description="Returns a paginated list of all books in the database.",
-        responses={200: BookSerializer(many=True)},
+        description=(
+            "Returns a paginated list of all books in the database. Pass "
+            "`pagination=cursor` for keyset pagination, which skips the total "
+            "count and keeps deep pages as fast as the first one. Books are "
+            "returned in a compact summary form unless `view=full` or `fields` "
+            "is given. Filter on Google Books attributes with `categories`, "
+            "`language`, `publisher`, `rating_min`/`rating_max` and "
+            "`pages_min`/`pages_max`. Responses carry an `ETag`; send it back "
+            "in `If-None-Match` to get a 304 while no book has changed."
+        ),
+        parameters=FIELDSET_PARAMETERS,
+        responses={200: BookSerializer(many=True), 304: None},
     )
+    @method_decorator(condition(etag_func=collection_etag))
+    @cache_response("list")
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        serializer = BookRowSerializer(self.get_requested_fields())
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *set(serializer.fields) | set(self.always_loaded_fields)
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(serializer.serialize(queryset))
+        return self.get_paginated_response(serializer.serialize(page))
 
     @extend_schema(
         summary="Create a new book",
-        description="Creates a new book and enriches it with data from Google Books API.",
+        description=(
+            "Creates a new book and queues its enrichment with data from Google "
+            "Books API. The response is returned immediately with "
+            "`enrichment_status` set to `pending`."
+        ),
         responses={201: BookSerializer},
     )
     def create(self, request, *args, **kwargs):
@@ -41,15 +189,35 @@ class BookViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="Retrieve a book",
-        description="Returns the details of a specific book.",
-        responses={200: BookSerializer},
+        description=(
+            "Returns the details of a specific book. Supports conditional "
+            "requests with `If-None-Match` (`ETag`) and `If-Modified-Since` "
+            "(`Last-Modified`), answered with a 304 when the book is unchanged."
+        ),
+        parameters=FIELDSET_PARAMETERS,
+        responses={200: BookSerializer, 304: None},
+    )
+    @method_decorator(
+        condition(etag_func=book_etag, last_modified_func=book_last_modified)
     )
+    @cache_response("retrieve")
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        serializer = BookRowSerializer(self.get_requested_fields())
+        if self.uses_object_permissions():
+            # Loads the Book and checks the object-level permissions on it
+            self.get_object()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.get_queryset().values(*serializer.fields),
+            **{self.lookup_field: kwargs[lookup_url_kwarg]},
+        )
+        return Response(serializer.to_representation(row))
 
     @extend_schema(
         summary="Update a book",
-        description="Updates a book's information and refreshes enriched data.",
+        description=(
+            "Updates a book's information and queues a refresh of its enriched data."
+        ),
         responses={200: BookSerializer},
     )
     def update(self, request, *args, **kwargs):
@@ -65,17 +233,298 @@ class BookViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer: Any) -> None:
         """
-        Overrides create method to enrich book data.
+        Overrides create method to queue enrichment of the book data.
         """
         instance = serializer.save()
-        self._enrich_book_data(instance)
+        enqueue_enrichment(instance)
 
     def perform_update(self, serializer: Any) -> None:
         """
-        Overrides update method to enrich book data.
+        Overrides update method to queue enrichment of the book data.
         """
-        instance = serializer.save()
-        self._enrich_book_data(instance)
+        instance = serializer.save(enrichment_status=Book.EnrichmentStatus.PENDING)
+        enqueue_enrichment(instance)
+
+    @extend_schema(
+        summary="Create or update books in bulk",
+        description=(
+            "Accepts a list of books and upserts them by ISBN: unknown ISBNs are "
+            "created, known ones updated. Each item is validated on its own and "
+            "reported in `results`, in request order, with its `status` "
+            "(`created`, `updated`, `unchanged` or `invalid`). New and changed "
+            "books are queued for enrichment."
+        ),
+        request=BookUpsertSerializer(many=True),
+        responses={
+            200: OpenApiExample(
+                "Results",
+                value={
+                    "created": 1,
+                    "updated": 0,
+                    "unchanged": 0,
+                    "invalid": 1,
+                    "results": [
+                        {
+                            "index": 0,
+                            "isbn": "9780261102217",
+                            "status": "created",
+                            "id": 1,
+                        },
+                        {
+                            "index": 1,
+                            "isbn": "123",
+                            "status": "invalid",
+                            "errors": {"isbn": ["ISBN must be 10 or 13 digits long."]},
+                        },
+                    ],
+                },
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], pagination_class=None)
+    def bulk(self, request: Any) -> Response:
+        """
+        Endpoint upserting many books in a few queries.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of books."]})
+        if len(items) > settings.BOOKS_BULK_MAX_ITEMS:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"At most {settings.BOOKS_BULK_MAX_ITEMS} books per request."
+                    ]
+                }
+            )
+
+        valid, errors = BookUpsertSerializer().validate_items(items)
+
+        # A single statement cannot upsert the same ISBN twice; first one wins.
+        unique: dict = {}
+        for index, data in valid:
+            if data["isbn"] in unique:
+                errors[index] = {"isbn": ["Duplicate ISBN in this request."]}
+            else:
+                unique[data["isbn"]] = (index, data)
+
+        written = upsert_books([data for _, data in unique.values()])
+
+        results = [None] * len(items)
+        for isbn, (index, _) in unique.items():
+            results[index] = {"index": index, "isbn": isbn, **written[isbn]}
+        for index, detail in errors.items():
+            isbn = items[index].get("isbn") if isinstance(items[index], dict) else None
+            results[index] = {
+                "index": index,
+                "isbn": isbn,
+                "status": "invalid",
+                "errors": detail,
+            }
+
+        summary = {
+            name: sum(1 for result in results if result["status"] == name)
+            for name in ("created", "updated", "unchanged", "invalid")
+        }
+        return Response({**summary, "results": results})
+
+    @extend_schema(
+        summary="Retrieve several books",
+        description=(
+            "Returns the books with the given ids or ISBNs (one of `id` or "
+            "`isbn`, comma-separated) in a single request, in the order they "
+            "were asked for. Keys matching no book are listed in `missing`."
+        ),
+        parameters=[
+            OpenApiParameter("id", str, description="Comma-separated book ids."),
+            OpenApiParameter("isbn", str, description="Comma-separated ISBNs."),
+        ]
+        + FIELDSET_PARAMETERS,
+        responses={
+            200: OpenApiExample(
+                "Books",
+                value={
+                    "results": [{"id": 1, "title": "The Hobbit"}],
+                    "missing": ["9780000000000"],
+                },
+            )
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def batch(self, request: Any) -> Response:
+        """
+        Endpoint resolving many books in one query.
+        """
+        params = request.query_params
+        if bool(params.get("id")) == bool(params.get("isbn")):
+            raise ValidationError(
+                {"non_field_errors": ["Pass exactly one of `id` or `isbn`."]}
+            )
+        key = "id" if params.get("id") else "isbn"
+
+        max_keys = settings.BOOKS_BATCH_MAX_KEYS
+        # Ordered set: keeps the first occurrence of each key
+        keys: Dict[Any, None] = {}
+        for value in params.getlist(key):
+            for item in value.split(","):
+                item = item.strip()
+                if key == "isbn":
+                    item = item.replace("-", "")
+                if not item:
+                    continue
+                if key == "id":
+                    try:
+                        item = int(item)
+                    except ValueError:
+                        raise ValidationError({"id": f"Invalid id: {item}."})
+                keys[item] = None
+                if len(keys) > max_keys:
+                    raise ValidationError(
+                        {key: f"At most {max_keys} keys per request."}
+                    )
+
+        # Annotated so the key is loaded even when `fields` leaves it out.
+        queryset = (
+            self.get_queryset()
+            .filter(**{f"{key}__in": keys})
+            .annotate(batch_key=F(key))
+            .order_by()
+        )
+        found = {book.batch_key: book for book in queryset}
+        books = [found[item] for item in keys if item in found]
+        serializer = self.get_serializer(books, many=True)
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [item for item in keys if item not in found],
+            }
+        )
+
+    @extend_schema(
+        summary="Export the catalog",
+        description=(
+            "Streams every book as newline-delimited JSON (`format=ndjson`, the "
+            "default), a JSON array (`format=json`) or CSV (`format=csv`). Rows "
+            "are read with a server-side cursor, so exports of any size use "
+            "constant memory, under WSGI and ASGI alike. Accepts the list "
+            "filters and `fields`/`exclude` projection."
+        ),
+        parameters=[
+            OpenApiParameter("format", str, enum=["ndjson", "json", "csv"]),
+        ]
+        + FIELDSET_PARAMETERS,
+        responses={
+            (200, "application/x-ndjson"): str,
+            (200, "application/json"): str,
+            (200, "text/csv"): str,
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        renderer_classes=[NDJSONRenderer, JSONArrayRenderer, CSVRenderer],
+    )
+    def export(self, request: Any) -> StreamingHttpResponse:
+        """
+        Endpoint streaming the whole (filtered) catalog.
+        """
+        fields = self.get_requested_fields()
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values(*fields)
+            .iterator(chunk_size=settings.BOOKS_EXPORT_CHUNK_SIZE)
+        )
+        renderer = request.accepted_renderer
+        if isinstance(request._request, ASGIRequest):
+            chunks = renderer.astream_chunks(rows, fields)
+        else:
+            chunks = renderer.stream_chunks(rows, fields)
+        response = StreamingHttpResponse(
+            chunks,
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="books.{renderer.format}"'
+        )
+        return response
+
+    @extend_schema(
+        summary="Search books",
+        description=(
+            "Full-text search over title, author, description and the enriched "
+            "subtitle, categories and publisher. Supports web search syntax "
+            '(`"quoted phrases"`, `or`, `-excluded`). Results are ranked by '
+            "relevance and paginated by page number."
+        ),
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Search terms.")
+        ]
+        + FIELDSET_PARAMETERS,
+        responses={200: BookSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request: Any) -> Response:
+        """
+        Endpoint to search books using the PostgreSQL full-text index.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()).search(query)
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        summary="Autocomplete titles and authors",
+        description=(
+            "Returns the books whose title or author best matches what the user "
+            "typed so far. Matching tolerates typos and partial words. Results "
+            "are cached per prefix until the catalog changes."
+        ),
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Typed text."),
+            OpenApiParameter(
+                "limit", int, description="Maximum number of suggestions."
+            ),
+        ],
+        responses={
+            200: OpenApiExample(
+                "Suggestions",
+                value={
+                    "query": "hobit",
+                    "results": [
+                        {
+                            "id": 1,
+                            "title": "The Hobbit",
+                            "author": "J.R.R. Tolkien",
+                            "isbn": "9780261102217",
+                        }
+                    ],
+                },
+            )
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def autocomplete(self, request: Any) -> Response:
+        """
+        Endpoint returning as-you-type suggestions.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        try:
+            limit = int(
+                request.query_params.get("limit", settings.AUTOCOMPLETE_DEFAULT_LIMIT)
+            )
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        limit = max(1, min(limit, settings.AUTOCOMPLETE_MAX_LIMIT))
+
+        return Response({"query": query, "results": get_suggestions(query, limit)})
 
     @extend_schema(
         summary="Refresh book's enriched data",
@@ -93,7 +542,11 @@ class BookViewSet(viewsets.ModelViewSet):
         Endpoint to manually update a book's enriched data.
         """
         book = get_object_or_404(Book, pk=pk)
-        enriched = self._enrich_book_data(book)
+        # Bypass every cache tier, on all workers, to fetch fresh data.
+        invalidate_book_info(book.isbn)
+        # A user is waiting: go ahead of background enrichment in the quota.
+        with enrichment_priority(INTERACTIVE):
+            enriched = self._enrich_book_data(book)
 
         if enriched:
             return Response({"status": "Data updated successfully"})
@@ -116,3 +569,15 @@ class BookViewSet(viewsets.ModelViewSet):
             book.update_enriched_data(enriched_data)
             return True
         return False
+
+
+@require_GET
+def metrics(request: Any) -> HttpResponse:
+    """
+    Exposes the process metrics in the Prometheus text format.
+
+    Served outside DRF so scrapers do not need a JWT token.
+    """
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
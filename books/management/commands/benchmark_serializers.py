@@ -0,0 +1,60 @@
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from books.api.renderers import FastJSONRenderer
+from books.api.serializers import BookRowSerializer, BookSerializer
+from books.models import Book
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the throughput of the DRF serializer and renderer with the "
+        "fast read path on books already in the database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="Books serialized per round"
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=10, help="Rounds timed for each path"
+        )
+
+    def handle(self, *args, **options):
+        fields = BookSerializer.Meta.fields
+        books = list(Book.objects.all()[: options["rows"]])
+        rows = list(Book.objects.values(*fields)[: options["rows"]])
+        if not books:
+            raise CommandError("No books to serialize; run seed_books or import_books")
+
+        def drf() -> bytes:
+            return JSONRenderer().render(BookSerializer(books, many=True).data)
+
+        def fast() -> bytes:
+            return FastJSONRenderer().render(BookRowSerializer(fields).serialize(rows))
+
+        if drf() != fast():
+            raise CommandError("The fast path output differs from DRF's")
+
+        baseline = self._measure(
+            "DRF serializer + JSONRenderer", drf, len(books), options
+        )
+        optimized = self._measure("Row serializer + orjson", fast, len(rows), options)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Speedup: {optimized / baseline:.1f}x (identical output)"
+            )
+        )
+
+    def _measure(self, name: str, fn: Callable, count: int, options) -> float:
+        fn()  # warm up
+        started = time.perf_counter()
+        for _ in range(options["rounds"]):
+            fn()
+        elapsed = time.perf_counter() - started
+        rate = count * options["rounds"] / elapsed
+        self.stdout.write(f"{name}: {rate:,.0f} rows/s")
+        return rate
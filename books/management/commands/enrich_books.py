@@ -0,0 +1,141 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from books.models import Book
+from books.services import (
+    BookEnrichmentService,
+    bump_collection_version,
+    close_async_http_client,
+)
+
+
+class Command(BaseCommand):
+    help = "Enriches every book missing (or with stale) Google Books data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Number of concurrent Google Books requests",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Books fetched from the database and written back per batch",
+        )
+        parser.add_argument(
+            "--stale-days",
+            type=int,
+            default=None,
+            help="Also refresh books enriched more than this many days ago",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help=(
+                "Fetch with the async client on one event loop instead of a "
+                "thread pool; --workers then caps the requests in flight"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        condition = Q(enriched_data__isnull=True)
+        if options["stale_days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["stale_days"])
+            condition |= Q(enriched_at__isnull=True) | Q(enriched_at__lt=cutoff)
+
+        # Stream rows with a server-side cursor instead of loading the table.
+        books = (
+            Book.objects.filter(condition)
+            .only("id", "isbn")
+            .order_by("id")
+            .iterator(chunk_size=batch_size)
+        )
+
+        workers = max(1, options["workers"])
+        started = time.monotonic()
+
+        if options["use_async"]:
+            loop = asyncio.new_event_loop()
+            semaphore = asyncio.Semaphore(workers)
+
+            async def fetch(isbn: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await BookEnrichmentService.aget_book_info(isbn)
+
+            async def fetch_all(isbns: List[str]) -> List[Optional[Dict[str, Any]]]:
+                return await asyncio.gather(*(fetch(isbn) for isbn in isbns))
+
+            try:
+                processed, enriched = self._run(
+                    books,
+                    batch_size,
+                    lambda isbns: loop.run_until_complete(fetch_all(isbns)),
+                )
+            finally:
+                loop.run_until_complete(close_async_http_client())
+                loop.close()
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                processed, enriched = self._run(
+                    books,
+                    batch_size,
+                    lambda isbns: executor.map(
+                        BookEnrichmentService.get_book_info, isbns
+                    ),
+                )
+
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Enriched {enriched}/{processed} book(s) in {elapsed:.2f}s "
+                f"({rate:.1f} ISBNs/s), {processed - enriched} failure(s)"
+            )
+        )
+
+    def _run(self, books: Any, batch_size: int, fetch: Callable) -> tuple:
+        """Enriches `books` in batches, returning `(processed, enriched)`."""
+        processed = enriched = 0
+        batch: List[Book] = []
+        for book in books:
+            batch.append(book)
+            if len(batch) >= batch_size:
+                enriched += self._enrich_batch(fetch, batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            enriched += self._enrich_batch(fetch, batch)
+            processed += len(batch)
+        return processed, enriched
+
+    def _enrich_batch(self, fetch: Callable, batch: List[Book]) -> int:
+        """Fetches a batch concurrently and saves the successes in one query."""
+        results = fetch([book.isbn for book in batch])
+
+        updated = []
+        for book, enriched_data in zip(batch, results):
+            if enriched_data:
+                book.apply_enriched_data(enriched_data)
+                updated.append(book)
+
+        if updated:
+            Book.objects.bulk_update(updated, Book.ENRICHMENT_FIELDS)
+            # bulk_update bypasses save(), so refresh the search documents here.
+            Book.objects.filter(
+                pk__in=[book.pk for book in updated]
+            ).update_search_vector()
+            bump_collection_version()
+        return len(updated)
@@ -0,0 +1,217 @@
+import csv
+import io
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from books.models import Book
+from books.services import bump_collection_version, enqueue_enrichment_many
+
+# Columns read from the input file
+IMPORT_FIELDS = ["isbn", "title", "author", "description", "published_date"]
+
+
+def normalize_isbn(value: Any) -> Optional[str]:
+    """Strips separators from an ISBN, or returns None if it is not valid."""
+    isbn = str(value or "").replace("-", "").replace(" ", "").upper()
+    if len(isbn) == 13 and isbn.isdigit():
+        return isbn
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == "X"):
+        return isbn
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports books from a CSV or NDJSON file, creating new ISBNs and updating "
+        "existing ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            default=None,
+            help="Input format (guessed from the file extension by default)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows copied and merged per transaction",
+        )
+        parser.add_argument(
+            "--enrich",
+            action="store_true",
+            help="Also queue changed books for enrichment (new ones always are)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        batch_size = max(1, options["batch_size"])
+
+        self.enrich = options["enrich"]
+        self.created = self.updated = self.invalid = 0
+        processed = 0
+        started = time.monotonic()
+
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            batch: List[Tuple[int, Dict[str, Any]]] = []
+            for line, record in self._read(stream, input_format):
+                processed += 1
+                row = self._clean(line, record)
+                if row is not None:
+                    batch.append((line, row))
+                if len(batch) >= batch_size:
+                    self._merge(batch)
+                    batch = []
+            if batch:
+                self._merge(batch)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if self.created or self.updated:
+            bump_collection_version()
+
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        unchanged = processed - self.invalid - self.created - self.updated
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {processed} row(s) in {elapsed:.2f}s ({rate:.1f} rows/s): "
+                f"{self.created} created, {self.updated} updated, "
+                f"{unchanged} unchanged or duplicated, {self.invalid} invalid"
+            )
+        )
+
+    def _read(self, stream: Any, input_format: str) -> Iterator[Tuple[int, Any]]:
+        """Yields `(line number, record)` pairs from the input."""
+        if input_format == "csv":
+            reader = csv.DictReader(stream)
+            missing = (
+                set(IMPORT_FIELDS) - set(reader.fieldnames or []) - {"description"}
+            )
+            if missing:
+                raise CommandError(
+                    f"Missing CSV column(s): {', '.join(sorted(missing))}"
+                )
+            for record in reader:
+                yield reader.line_num, record
+            return
+
+        for line_num, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line_num, json.loads(text)
+            except ValueError:
+                yield line_num, None
+
+    def _clean(self, line: int, record: Any) -> Optional[Dict[str, Any]]:
+        """Validates and normalizes a record, reporting it if invalid."""
+        error = None
+        if not isinstance(record, dict):
+            error = "not a valid record"
+        else:
+            row = {name: str(record.get(name) or "").strip() for name in IMPORT_FIELDS}
+            row["isbn"] = normalize_isbn(row["isbn"])
+            if row["isbn"] is None:
+                error = "invalid ISBN"
+            elif not row["title"] or len(row["title"]) > 200:
+                error = "title must have 1 to 200 characters"
+            elif not row["author"] or len(row["author"]) > 200:
+                error = "author must have 1 to 200 characters"
+            else:
+                # Stricter than date.fromisoformat, which also takes forms such
+                # as 20240101 or 2024-W01-1 that would make COPY fail.
+                try:
+                    published = datetime.strptime(row["published_date"], "%Y-%m-%d")
+                except ValueError:
+                    error = "published_date must be YYYY-MM-DD"
+                else:
+                    row["published_date"] = published.date().isoformat()
+
+        if error:
+            self.invalid += 1
+            self.stderr.write(f"Line {line}: {error}")
+            return None
+        return row
+
+    def _merge(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Copies a batch into a staging table and upserts it into the books table.
+
+        Within the batch, the last row of each ISBN wins. Existing books are only
+        rewritten when their data changed. New books are queued for enrichment,
+        like books created through the API; changed ones only with `--enrich`.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for line, row in batch:
+            writer.writerow([line] + [row[name] for name in IMPORT_FIELDS])
+        buffer.seek(0)
+
+        table = Book._meta.db_table
+        # Changed books only go back to pending when they are queued again.
+        reset_status = (
+            "enrichment_status = EXCLUDED.enrichment_status," if self.enrich else ""
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS book_import ("
+                " line bigint, isbn text, title text, author text,"
+                " description text, published_date date"
+                ") ON COMMIT DROP"
+            )
+            cursor.execute("TRUNCATE book_import")
+            cursor.copy_expert(
+                "COPY book_import (line, isbn, title, author, description,"
+                " published_date) FROM STDIN"
+                " WITH (FORMAT csv, FORCE_NOT_NULL (description))",
+                buffer,
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {table} AS book (
+                    isbn, title, author, description, published_date,
+                    enrichment_status, created_at, updated_at
+                )
+                SELECT DISTINCT ON (isbn)
+                    isbn, title, author, description, published_date,
+                    %s, now(), now()
+                FROM book_import
+                ORDER BY isbn, line DESC
+                ON CONFLICT (isbn) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    author = EXCLUDED.author,
+                    description = EXCLUDED.description,
+                    published_date = EXCLUDED.published_date,
+                    {reset_status}
+                    updated_at = EXCLUDED.updated_at
+                WHERE (book.title, book.author, book.description, book.published_date)
+                    IS DISTINCT FROM (EXCLUDED.title, EXCLUDED.author,
+                    EXCLUDED.description, EXCLUDED.published_date)
+                RETURNING id, xmax = 0
+                """,
+                [Book.EnrichmentStatus.PENDING],
+            )
+            written = cursor.fetchall()
+
+            ids = [pk for pk, _ in written]
+            inserted = [pk for pk, is_insert in written if is_insert]
+            self.created += len(inserted)
+            self.updated += len(written) - len(inserted)
+            if ids:
+                Book.objects.filter(pk__in=ids).update_search_vector()
+                enqueue_enrichment_many(ids if self.enrich else inserted)
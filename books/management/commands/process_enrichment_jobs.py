@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from books.services import claim_enrichment_jobs, process_enrichment_job
+
+
+class Command(BaseCommand):
+    help = "Runs a worker that drains the book enrichment job queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Number of jobs claimed per database round trip",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Number of worker threads in this process",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is drained instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        self.stdout.write(f"Starting enrichment worker with {concurrency} thread(s)...")
+
+        worker_args = (options["batch_size"], options["poll_interval"], options["once"])
+        if concurrency == 1:
+            results = [self._run_worker(*worker_args, close_connection=False)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(self._run_worker, *worker_args)
+                    for _ in range(concurrency)
+                ]
+                results = [future.result() for future in futures]
+
+        processed = sum(total for total, _ in results)
+        succeeded = sum(ok for _, ok in results)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} job(s): {succeeded} enriched, "
+                f"{processed - succeeded} failed or rescheduled"
+            )
+        )
+
+    def _run_worker(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        once: bool,
+        close_connection: bool = True,
+    ):
+        processed = succeeded = 0
+        try:
+            while True:
+                jobs = claim_enrichment_jobs(batch_size)
+                if not jobs:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                for job in jobs:
+                    processed += 1
+                    if process_enrichment_job(job):
+                        succeeded += 1
+        finally:
+            # Worker threads own their database connection; release it on exit.
+            if close_connection:
+                connection.close()
+        return processed, succeeded
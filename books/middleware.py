@@ -0,0 +1,145 @@
+import cProfile
+import hmac
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .services import profiling
+
+logger = logging.getLogger("books.requests")
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+# cProfile cannot profile two requests of a process at once
+_profiler_lock = threading.Lock()
+
+
+class RequestProfilingMiddleware:
+    """
+    Measures where the time of each request goes.
+
+    Records the wall time and the count and duration of SQL queries, cache
+    (Redis) round trips and outbound HTTP calls. They are logged as one
+    `key=value` line per request, at WARNING level above
+    `PROFILING_SLOW_REQUEST_MS`.
+
+    A request whose `X-Profile` header matches `PROFILING_TOKEN` gets them
+    back in a `Server-Timing` header (every request does with
+    `PROFILING_SERVER_TIMING`), and is run under cProfile with its stats
+    dumped to `PROFILING_DUMP_DIR`. cProfile is skipped for requests served
+    asynchronously (under ASGI): they share the event loop thread with other
+    requests, whose calls would end up in the dump.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Any) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: Any) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        authorized = self._profiling_requested(request)
+        profile, token, profiler, started = self._start(profile_calls=authorized)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(token, profiler)
+        return self._finish(request, response, profile, profiler, authorized, started)
+
+    async def __acall__(self, request: Any) -> Any:
+        authorized = self._profiling_requested(request)
+        profile, token, profiler, started = self._start(profile_calls=False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(token, profiler)
+        return self._finish(request, response, profile, profiler, authorized, started)
+
+    def _start(self, profile_calls: bool) -> tuple:
+        profile = profiling.RequestProfile()
+        token = profiling.activate(profile)
+        profiler = None
+        if profile_calls and _profiler_lock.acquire(False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profile, token, profiler, time.perf_counter()
+
+    def _stop(self, token: Any, profiler: Optional[cProfile.Profile]) -> None:
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+        profiling.deactivate(token)
+
+    @staticmethod
+    def _profiling_requested(request: Any) -> bool:
+        expected = getattr(settings, "PROFILING_TOKEN", "")
+        provided = request.META.get(PROFILE_HEADER, "")
+        return bool(expected and provided) and hmac.compare_digest(
+            provided.encode(), expected.encode()
+        )
+
+    def _finish(
+        self,
+        request: Any,
+        response: Any,
+        profile: profiling.RequestProfile,
+        profiler: Optional[cProfile.Profile],
+        authorized: bool,
+        started: float,
+    ) -> Any:
+        total_ms = (time.perf_counter() - started) * 1000
+        durations_ms = {
+            kind: duration * 1000 for kind, duration in profile.durations.items()
+        }
+
+        if authorized or getattr(settings, "PROFILING_SERVER_TIMING", False):
+            response["Server-Timing"] = ", ".join(
+                [f"total;dur={total_ms:.1f}"]
+                + [
+                    f'{kind};desc="{profile.calls[kind]} calls";'
+                    f"dur={durations_ms[kind]:.1f}"
+                    for kind in (profiling.SQL, profiling.CACHE, profiling.HTTP)
+                ]
+            )
+
+        if profiler is not None:
+            response["X-Profile-Dump"] = self._dump(profiler)
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": f"{total_ms:.1f}",
+            "sql_queries": profile.calls[profiling.SQL],
+            "sql_ms": f"{durations_ms[profiling.SQL]:.1f}",
+            "cache_calls": profile.calls[profiling.CACHE],
+            "cache_ms": f"{durations_ms[profiling.CACHE]:.1f}",
+            "http_calls": profile.calls[profiling.HTTP],
+            "http_ms": f"{durations_ms[profiling.HTTP]:.1f}",
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if total_ms >= getattr(settings, "PROFILING_SLOW_REQUEST_MS", 1000):
+            logger.warning(f"Slow request {message}", extra={"profile": fields})
+        else:
+            logger.info(f"Request {message}", extra={"profile": fields})
+        return response
+
+    @staticmethod
+    def _dump(profiler: cProfile.Profile) -> str:
+        """Writes the stats in pstats format, returning the file name."""
+        directory = getattr(settings, "PROFILING_DUMP_DIR", "")
+        name = f"request-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(os.path.join(directory, name))
+        logger.info(f"Request profile written to {os.path.join(directory, name)}")
+        return name
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def mark_enriched_books(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    Book.objects.filter(enriched_data__isnull=False).update(
+        enrichment_status="enriched"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="enrichment_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("enriched", "Enriched"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                help_text="State of the Google Books enrichment",
+                max_length=16,
+            ),
+        ),
+        migrations.CreateModel(
+            name="EnrichmentJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "run_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time the job may be claimed",
+                    ),
+                ),
+                (
+                    "locked_at",
+                    models.DateTimeField(
+                        blank=True, help_text="When a worker claimed the job", null=True
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="enrichment_jobs",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["run_after"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "run_after"],
+                        name="books_enric_status_2e873b_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="enrichmentjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "queued")),
+                fields=("book",),
+                name="unique_queued_enrichment_job",
+            ),
+        ),
+        migrations.RunPython(mark_enriched_books, migrations.RunPython.noop),
+    ]
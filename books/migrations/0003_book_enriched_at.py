@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:14
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_enriched_at(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    Book.objects.filter(enriched_data__isnull=False).update(enriched_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_enrichment_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="enriched_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the enriched data was last fetched",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_enriched_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:21
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking writes on large tables
+    atomic = False
+
+    dependencies = [
+        ("books", "0003_book_enriched_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="book",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        AddIndexConcurrently(
+            model_name="book",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="book_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:22
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.fields.json import KeyTextTransform
+
+
+def backfill_search_vector(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    Book.objects.update(
+        search_vector=(
+            SearchVector("title", "author", weight="A", config="english")
+            + SearchVector(
+                KeyTextTransform("subtitle", "enriched_data"),
+                KeyTextTransform("categories", "enriched_data"),
+                KeyTextTransform("publisher", "enriched_data"),
+                weight="B",
+                config="english",
+            )
+            + SearchVector(
+                "description",
+                KeyTextTransform("description", "enriched_data"),
+                weight="C",
+                config="english",
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking writes on large tables
+    atomic = False
+
+    dependencies = [
+        ("books", "0004_book_created_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, help_text="Full-text search document", null=True
+            ),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="book",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="book_search_vector_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:27
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+def _to_number(value, kind):
+    try:
+        return kind(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backfill_enriched_columns(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    books = (
+        Book.objects.filter(enriched_data__isnull=False)
+        .only("id", "enriched_data")
+        .iterator(chunk_size=1000)
+    )
+    batch = []
+    for book in books:
+        book.enriched_average_rating = _to_number(
+            book.enriched_data.get("average_rating"), float
+        )
+        book.enriched_page_count = _to_number(book.enriched_data.get("page_count"), int)
+        batch.append(book)
+        if len(batch) >= 1000:
+            Book.objects.bulk_update(
+                batch, ["enriched_average_rating", "enriched_page_count"]
+            )
+            batch = []
+    if batch:
+        Book.objects.bulk_update(
+            batch, ["enriched_average_rating", "enriched_page_count"]
+        )
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking writes on large tables
+    atomic = False
+
+    dependencies = [
+        ("books", "0006_book_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="enriched_average_rating",
+            field=models.FloatField(
+                blank=True, editable=False, help_text="Google Books rating", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="enriched_page_count",
+            field=models.PositiveIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Google Books page count",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_enriched_columns, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="book",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["enriched_data"],
+                name="book_enriched_data_idx",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="book",
+            index=models.Index(
+                fields=["enriched_average_rating"], name="book_enriched_rating_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="book",
+            index=models.Index(
+                fields=["enriched_page_count"], name="book_enriched_pages_idx"
+            ),
+        ),
+    ]
@@ -1,10 +1,99 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
 from django.core.validators import MinLengthValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+# Text search configuration used to build and query `Book.search_vector`
+SEARCH_CONFIG = "english"
+
+
+def book_search_vector() -> SearchVector:
+    """
+    Expression computing a book's weighted search document.
+
+    Title and author rank highest, then the enriched subtitle, categories and
+    publisher, then the descriptions.
+    """
+    return (
+        SearchVector("title", "author", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(
+            KeyTextTransform("subtitle", "enriched_data"),
+            KeyTextTransform("categories", "enriched_data"),
+            KeyTextTransform("publisher", "enriched_data"),
+            weight="B",
+            config=SEARCH_CONFIG,
+        )
+        + SearchVector(
+            "description",
+            KeyTextTransform("description", "enriched_data"),
+            weight="C",
+            config=SEARCH_CONFIG,
+        )
+    )
+
+
+def _to_number(value: Any, kind: type) -> Optional[Any]:
+    """Converts an enriched attribute to `kind`, or None if it is not numeric."""
+    try:
+        return kind(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class BookQuerySet(models.QuerySet):
+    def update_search_vector(self) -> int:
+        """Recomputes the search document of every book in the queryset."""
+        return self.update(search_vector=book_search_vector())
+
+    def search(self, text: str) -> "BookQuerySet":
+        """Full-text search, best matches first. Accepts web search syntax."""
+        query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            self.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at", "-id")
+        )
+
+    def suggest(self, prefix: str) -> "BookQuerySet":
+        """
+        Typo-tolerant as-you-type matching on title and author.
+
+        Uses pg_trgm word similarity, so `prefix` may be the start of a word or
+        contain small typos. Both conditions are served by trigram GIN indexes.
+        """
+        return (
+            self.filter(
+                Q(title__trigram_word_similar=prefix)
+                | Q(author__trigram_word_similar=prefix)
+            )
+            .annotate(
+                score=Greatest(
+                    TrigramWordSimilarity(prefix, "title"),
+                    TrigramWordSimilarity(prefix, "author"),
+                )
+            )
+            .order_by("-score", "title", "id")
+        )
 
 
 class Book(models.Model):
+    class EnrichmentStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        ENRICHED = "enriched", "Enriched"
+        FAILED = "failed", "Failed"
+
     title = models.CharField(
         max_length=200, validators=[MinLengthValidator(1)], help_text="Book title"
     )
@@ -24,19 +113,136 @@ class Book(models.Model):
     enriched_data = models.JSONField(
         null=True, blank=True, help_text="Enriched book data"
     )
+    enrichment_status = models.CharField(
+        max_length=16,
+        choices=EnrichmentStatus.choices,
+        default=EnrichmentStatus.PENDING,
+        help_text="State of the Google Books enrichment",
+    )
+    enriched_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the enriched data was last fetched"
+    )
+    # Copies of numeric enriched attributes, so range filters can use btree
+    # indexes instead of casting every JSON document
+    enriched_average_rating = models.FloatField(
+        null=True, blank=True, editable=False, help_text="Google Books rating"
+    )
+    enriched_page_count = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, help_text="Google Books page count"
+    )
+    search_vector = SearchVectorField(
+        null=True, editable=False, help_text="Full-text search document"
+    )
+
+    objects = BookQuerySet.as_manager()
+
+    # Fields feeding the search document
+    SEARCH_FIELDS = {"title", "author", "description", "enriched_data"}
+
+    # Columns written when enriched data is stored, for use with bulk_update
+    ENRICHMENT_FIELDS = [
+        "enriched_data",
+        "enrichment_status",
+        "enriched_at",
+        "enriched_average_rating",
+        "enriched_page_count",
+        "updated_at",
+    ]
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
         indexes = [
             models.Index(fields=["isbn"]),
             models.Index(fields=["title"]),
             models.Index(fields=["author"]),
+            # Serves the default ordering and keyset pagination
+            models.Index(fields=["-created_at", "-id"], name="book_created_id_idx"),
+            GinIndex(fields=["search_vector"], name="book_search_vector_idx"),
+            # Serves containment filters (`enriched_data @> {...}`)
+            GinIndex(
+                fields=["enriched_data"],
+                name="book_enriched_data_idx",
+                opclasses=["jsonb_path_ops"],
+            ),
+            models.Index(
+                fields=["enriched_average_rating"], name="book_enriched_rating_idx"
+            ),
+            models.Index(
+                fields=["enriched_page_count"], name="book_enriched_pages_idx"
+            ),
+            GinIndex(
+                fields=["title"], name="book_title_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+            GinIndex(
+                fields=["author"],
+                name="book_author_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self) -> str:
         return f"{self.title} by {self.author}"
 
+    def save(self, *args, **kwargs) -> None:
+        update_fields = kwargs.get("update_fields")
+        # The row and its search vector are written together or not at all
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or self.SEARCH_FIELDS.intersection(update_fields):
+                Book.objects.filter(pk=self.pk).update_search_vector()
+
+    def apply_enriched_data(self, data: Dict[str, Any]) -> None:
+        """Sets the book's enriched data without saving it."""
+        now = timezone.now()
+        self.enriched_data = data
+        self.enriched_average_rating = _to_number(data.get("average_rating"), float)
+        self.enriched_page_count = _to_number(data.get("page_count"), int)
+        self.enrichment_status = self.EnrichmentStatus.ENRICHED
+        self.enriched_at = now
+        self.updated_at = now
+
     def update_enriched_data(self, data: Dict[str, Any]) -> None:
         """Updates the book's enriched data."""
-        self.enriched_data = data
-        self.save(update_fields=["enriched_data", "updated_at"])
+        self.apply_enriched_data(data)
+        self.save(update_fields=self.ENRICHMENT_FIELDS)
+
+
+class EnrichmentJob(models.Model):
+    """Queued request to enrich a book, drained by `process_enrichment_jobs`."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="enrichment_jobs"
+    )
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(
+        default=timezone.now, help_text="Earliest time the job may be claimed"
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, help_text="When a worker claimed the job"
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_after"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book"],
+                condition=Q(status="queued"),
+                name="unique_queued_enrichment_job",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Enrichment job for book {self.book_id} ({self.status})"
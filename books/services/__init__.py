@@ -1,4 +1,49 @@
-from .cache import cache_book_info
-from .enrichment import BookEnrichmentService
+from .autocomplete import get_suggestions
+from .bulk import upsert_books
+from .cache import (
+    async_cache_book_info,
+    bump_collection_version,
+    cache_book_info,
+    get_collection_version,
+    invalidate_book_info,
+)
+from .enrichment import BookEnrichmentService, close_async_http_client
+from .exceptions import (
+    CircuitOpenError,
+    EnrichmentError,
+    RateLimitedError,
+    TransientEnrichmentError,
+)
+from .jobs import (
+    claim_enrichment_jobs,
+    enqueue_enrichment,
+    enqueue_enrichment_many,
+    process_enrichment_job,
+)
+from .rate_limit import BACKGROUND, INTERACTIVE, enrichment_priority
+from .users import get_cached_user, invalidate_cached_user
 
-__all__ = ["BookEnrichmentService", "cache_book_info"]
+__all__ = [
+    "BookEnrichmentService",
+    "CircuitOpenError",
+    "BACKGROUND",
+    "EnrichmentError",
+    "INTERACTIVE",
+    "RateLimitedError",
+    "TransientEnrichmentError",
+    "async_cache_book_info",
+    "bump_collection_version",
+    "cache_book_info",
+    "claim_enrichment_jobs",
+    "close_async_http_client",
+    "enqueue_enrichment",
+    "enqueue_enrichment_many",
+    "enrichment_priority",
+    "get_cached_user",
+    "get_collection_version",
+    "get_suggestions",
+    "invalidate_book_info",
+    "invalidate_cached_user",
+    "process_enrichment_job",
+    "upsert_books",
+]
@@ -0,0 +1,72 @@
+import hashlib
+import logging
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import Book
+from .cache import get_collection_version
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_REQUESTS = Counter(
+    "books_autocomplete_requests_total",
+    "Autocomplete lookups by result (hit, miss).",
+    ["result"],
+)
+
+# Columns returned for each suggestion
+SUGGESTION_FIELDS = ("id", "title", "author", "isbn")
+
+
+def normalize_prefix(text: str) -> str:
+    """Lowercases and collapses whitespace so equivalent inputs share a cache entry."""
+    return " ".join(text.lower().split())
+
+
+def get_suggestions(text: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Returns the top `limit` books whose title or author matches `text`.
+
+    Results are cached per normalized prefix and keyed by the collection
+    version, so any change to the books invalidates them at once.
+
+    Args:
+        text: What the user typed so far
+        limit: Maximum number of suggestions
+
+    Returns:
+        List of dicts with the id, title, author and isbn of each book
+    """
+    prefix = normalize_prefix(text)
+    if len(prefix) < getattr(settings, "AUTOCOMPLETE_MIN_LENGTH", 2):
+        return []
+
+    digest = hashlib.sha1(prefix.encode()).hexdigest()
+    try:
+        cache_key = f"autocomplete:{get_collection_version()}:{limit}:{digest}"
+        suggestions = cache.get(cache_key)
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+        cache_key = suggestions = None
+
+    if suggestions is not None:
+        AUTOCOMPLETE_REQUESTS.inc(result="hit")
+        return suggestions
+
+    AUTOCOMPLETE_REQUESTS.inc(result="miss")
+    suggestions = list(Book.objects.suggest(prefix).values(*SUGGESTION_FIELDS)[:limit])
+    if cache_key is None:
+        # The cache is unavailable
+        return suggestions
+    try:
+        cache.set(
+            cache_key,
+            suggestions,
+            timeout=getattr(settings, "AUTOCOMPLETE_CACHE_TTL", 300),
+        )
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+    return suggestions
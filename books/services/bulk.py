@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.db import transaction
+
+from ..models import Book
+from .cache import bump_collection_version
+from .jobs import enqueue_enrichment_many
+
+logger = logging.getLogger(__name__)
+
+# Columns a bulk upsert may overwrite on existing books
+UPSERT_FIELDS = ["title", "author", "description", "published_date"]
+
+
+def upsert_books(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Creates or updates books by ISBN with as few queries as possible.
+
+    Books whose data did not change are left untouched. New and changed books
+    are written with `INSERT ... ON CONFLICT (isbn) DO UPDATE` in batches of
+    `BOOKS_BULK_BATCH_SIZE` and queued for enrichment with a single insert.
+
+    Args:
+        items: Validated book data, with unique ISBNs
+
+    Returns:
+        Dict mapping each ISBN to its `id` and `status`
+        (`created`, `updated` or `unchanged`)
+    """
+    isbns = [item["isbn"] for item in items]
+    existing = {
+        row["isbn"]: row
+        for row in Book.objects.filter(isbn__in=isbns).values(
+            "id", "isbn", *UPSERT_FIELDS
+        )
+    }
+
+    statuses: Dict[str, str] = {}
+    books: List[Book] = []
+    for item in items:
+        current = existing.get(item["isbn"])
+        if current is None:
+            statuses[item["isbn"]] = "created"
+        elif any(current[name] != item.get(name, "") for name in UPSERT_FIELDS):
+            statuses[item["isbn"]] = "updated"
+        else:
+            statuses[item["isbn"]] = "unchanged"
+            continue
+        books.append(
+            Book(
+                isbn=item["isbn"],
+                enrichment_status=Book.EnrichmentStatus.PENDING,
+                **{name: item.get(name, "") for name in UPSERT_FIELDS},
+            )
+        )
+
+    ids = {isbn: row["id"] for isbn, row in existing.items()}
+    if books:
+        with transaction.atomic():
+            Book.objects.bulk_create(
+                books,
+                batch_size=getattr(settings, "BOOKS_BULK_BATCH_SIZE", 500),
+                update_conflicts=True,
+                unique_fields=["isbn"],
+                update_fields=UPSERT_FIELDS + ["enrichment_status", "updated_at"],
+            )
+            # Postgres does not return the ids of upserted rows to Django 4.2.
+            written = dict(
+                Book.objects.filter(isbn__in=[book.isbn for book in books]).values_list(
+                    "isbn", "id"
+                )
+            )
+            ids.update(written)
+            Book.objects.filter(pk__in=written.values()).update_search_vector()
+            enqueue_enrichment_many(written.values())
+        bump_collection_version()
+        logger.info(f"Upserted {len(books)} book(s) in bulk")
+
+    return {
+        isbn: {"id": ids[isbn], "status": status} for isbn, status in statuses.items()
+    }
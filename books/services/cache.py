@@ -1,14 +1,93 @@
+import asyncio
+import copy
 import json
 import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
 from django_redis import get_redis_connection
 
+from .exceptions import TransientEnrichmentError
+from .local_cache import LocalCache, broadcast_invalidation, invalidation_listener
+from .metrics import Counter, Histogram
+from .singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+CACHE_REQUESTS = Counter(
+    "books_cache_requests_total",
+    "Cache lookups by operation and result "
+    "(hit, stale_hit, negative_hit, miss, invalid, error).",
+    ["operation", "result"],
+)
+CACHE_LOOKUP_SECONDS = Histogram(
+    "books_cache_lookup_seconds",
+    "Latency of cache lookups in seconds.",
+    ["operation"],
+)
+CACHE_TIER_REQUESTS = Counter(
+    "books_cache_tier_requests_total",
+    "Cache lookups per tier (local, shared) and result (hit, miss).",
+    ["tier", "result"],
+)
+CACHE_COALESCED_REQUESTS = Counter(
+    "books_cache_coalesced_requests_total",
+    "Cache misses served by a fetch already in flight in the same process.",
+    ["operation"],
+)
+CACHE_LOCK_WAIT_SECONDS = Histogram(
+    "books_cache_lock_wait_seconds",
+    "Time spent waiting for the cross-worker fetch lock, by outcome "
+    "(acquired, served, released, timeout, error).",
+    ["outcome"],
+)
+CACHE_REVALIDATIONS = Counter(
+    "books_cache_revalidations_total",
+    "Background refreshes of stale entries by outcome "
+    "(refreshed, failed, skipped, error).",
+    ["operation", "outcome"],
+)
+
+# Concurrent misses for the same key in this process share one fetch
+_single_flight = SingleFlight()
+
+# In-process tier kept in front of Redis for the hottest ISBNs
+book_info_local_cache = LocalCache(
+    "book_info",
+    max_entries=getattr(settings, "LOCAL_CACHE_MAX_ENTRIES", 1024),
+    ttl=getattr(settings, "LOCAL_CACHE_TTL", 60),
+)
+
+
+# Negative entries are stored as {NEGATIVE_CACHE_MARKER: reason}
+NEGATIVE_CACHE_MARKER = "__negative__"
+NOT_FOUND = "not_found"
+UNAVAILABLE = "unavailable"
+
+# With stale-while-revalidate, book data is stored as
+# {STALE_AFTER_MARKER: soft expiry timestamp, VALUE_MARKER: data}
+STALE_AFTER_MARKER = "__stale_after__"
+VALUE_MARKER = "__value__"
+
+# Background refreshes of stale entries, and the keys currently scheduled
+_revalidation_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "CACHE_REVALIDATION_WORKERS", 4),
+    thread_name_prefix="cache-revalidate",
+)
+_revalidating: Set[str] = set()
+_revalidating_lock = threading.Lock()
+
+
+def _book_cache_key(isbn: str) -> str:
+    return f"book:{isbn}"
+
 
 def is_valid_enriched_data(data: Dict[str, Any]) -> bool:
     """
@@ -35,59 +114,476 @@ def is_valid_enriched_data(data: Dict[str, Any]) -> bool:
     return True
 
 
+def _negative_reason(entry: Any) -> Optional[str]:
+    """Returns why a cache entry is negative, or None for real book data."""
+    if isinstance(entry, dict):
+        return entry.get(NEGATIVE_CACHE_MARKER)
+    return None
+
+
+def _entry_timeout(entry: Dict[str, Any]) -> int:
+    reason = _negative_reason(entry)
+    if reason == NOT_FOUND:
+        return getattr(settings, "NEGATIVE_CACHE_TTL", 3600)
+    if reason == UNAVAILABLE:
+        return getattr(settings, "TRANSIENT_FAILURE_TTL", 30)
+    return getattr(settings, "CACHE_TTL", 86400)
+
+
+def _unwrap(raw: Any) -> Tuple[Any, bool]:
+    """Splits a stored value into the entry and whether it is past soft expiry."""
+    if isinstance(raw, dict) and STALE_AFTER_MARKER in raw:
+        return raw.get(VALUE_MARKER), raw[STALE_AFTER_MARKER] <= time.time()
+    return raw, False
+
+
+def _wrap(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Adds a soft expiry to book data when stale-while-revalidate is enabled."""
+    if _negative_reason(entry) or not getattr(
+        settings, "CACHE_STALE_WHILE_REVALIDATE", False
+    ):
+        return entry
+    soft_ttl = getattr(settings, "CACHE_SOFT_TTL", 43200)
+    return {STALE_AFTER_MARKER: time.time() + soft_ttl, VALUE_MARKER: entry}
+
+
+def _hit_result(entry: Dict[str, Any], stale: bool) -> str:
+    if _negative_reason(entry):
+        return "negative_hit"
+    return "stale_hit" if stale else "hit"
+
+
+def _lookup(cache_key: str, operation: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Reads an entry from the local tier, then from Redis.
+
+    Returns the entry (book data or a negative entry), or None on a miss,
+    along with whether the entry is past its soft expiry. Invalid entries
+    found in Redis are deleted and reported as a miss.
+    """
+    raw = book_info_local_cache.get(cache_key)
+    if raw is not None:
+        entry, stale = _unwrap(raw)
+        CACHE_TIER_REQUESTS.inc(tier="local", result="hit")
+        CACHE_REQUESTS.inc(operation=operation, result=_hit_result(entry, stale))
+        # Callers get their own copy so they cannot mutate the cached entry.
+        return copy.deepcopy(entry), stale
+    CACHE_TIER_REQUESTS.inc(tier="local", result="miss")
+
+    raw = cache.get(cache_key)
+    if raw is None:
+        CACHE_TIER_REQUESTS.inc(tier="shared", result="miss")
+        CACHE_REQUESTS.inc(operation=operation, result="miss")
+        return None, False
+
+    entry, stale = _unwrap(raw)
+    if _negative_reason(entry) or is_valid_enriched_data(entry):
+        logger.info(f"Cache HIT for {cache_key}")
+        CACHE_TIER_REQUESTS.inc(tier="shared", result="hit")
+        CACHE_REQUESTS.inc(operation=operation, result=_hit_result(entry, stale))
+        book_info_local_cache.set(
+            cache_key, copy.deepcopy(raw), ttl=_entry_timeout(entry)
+        )
+        return entry, stale
+
+    # If cached data is not valid, invalidate the cache
+    logger.warning(f"Invalid cached data found for {cache_key}. Invalidating cache.")
+    CACHE_TIER_REQUESTS.inc(tier="shared", result="miss")
+    CACHE_REQUESTS.inc(operation=operation, result="invalid")
+    cache.delete(cache_key)
+    get_redis_connection("default").delete(f"direct:{cache_key}")
+    return None, False
+
+
+def _store(cache_key: str, entry: Dict[str, Any], operation: str) -> None:
+    """Writes an entry to both tiers with the TTL matching its kind."""
+    timeout = _entry_timeout(entry)
+    raw = _wrap(entry)
+    book_info_local_cache.set(cache_key, copy.deepcopy(raw), ttl=timeout)
+    try:
+        cache.set(cache_key, raw, timeout=timeout)
+        if not _negative_reason(entry):
+            get_redis_connection("default").set(
+                f"direct:{cache_key}", json.dumps(entry), ex=timeout
+            )
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+        CACHE_REQUESTS.inc(operation=operation, result="error")
+
+
+def _resolve(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Maps a cache entry to the value returned to callers."""
+    return None if _negative_reason(entry) else entry
+
+
+def _fetch_and_store(
+    cache_key: str, func, isbn: str, operation: str
+) -> Optional[Dict[str, Any]]:
+    """Calls the wrapped function and caches its outcome."""
+    logger.info(f"Cache MISS for {cache_key}. Fetching data from API.")
+    try:
+        result = func(isbn)
+    except TransientEnrichmentError as e:
+        logger.warning(f"Enrichment unavailable for ISBN {isbn}: {e}")
+        _store(cache_key, {NEGATIVE_CACHE_MARKER: UNAVAILABLE}, operation)
+        return None
+
+    if result is None:
+        logger.info(f"No data found for ISBN {isbn}. Caching negative result.")
+        _store(cache_key, {NEGATIVE_CACHE_MARKER: NOT_FOUND}, operation)
+    elif is_valid_enriched_data(result):
+        logger.info(f"Caching valid data for ISBN {isbn}")
+        _store(cache_key, result, operation)
+    else:
+        logger.warning(f"Invalid or empty data received for ISBN {isbn}. Not caching.")
+
+    return result
+
+
+def _wait_for_entry(cache_key: str, lock_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Waits for the worker holding the fetch lock to cache its result.
+
+    Returns the cached entry, or None if the lock was released without a
+    usable entry or the wait timed out.
+    """
+    started = time.monotonic()
+    deadline = started + getattr(settings, "CACHE_LOCK_WAIT_TIMEOUT", 5)
+    poll_interval = getattr(settings, "CACHE_LOCK_POLL_INTERVAL", 0.05)
+
+    while True:
+        entry, _ = _unwrap(cache.get(cache_key))
+        if entry is not None and (
+            _negative_reason(entry) or is_valid_enriched_data(entry)
+        ):
+            outcome = "served"
+            break
+        if cache.get(lock_key) is None:
+            entry, outcome = None, "released"
+            break
+        if time.monotonic() >= deadline:
+            entry, outcome = None, "timeout"
+            break
+        time.sleep(poll_interval)
+
+    CACHE_LOCK_WAIT_SECONDS.observe(time.monotonic() - started, outcome=outcome)
+    return entry
+
+
+def _load(cache_key: str, func, isbn: str, operation: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetches a missing entry, letting only one worker call the API at a time.
+
+    A short-lived lock is taken with an atomic add in the shared cache. Workers
+    that lose the race wait for the winner's result instead of fetching the
+    same ISBN again, and fall back to fetching it themselves on timeout.
+    """
+    lock_key = f"lock:{cache_key}"
+    token = uuid.uuid4().hex
+    try:
+        acquired = cache.add(
+            lock_key, token, timeout=getattr(settings, "CACHE_LOCK_TIMEOUT", 10)
+        )
+    except Exception as e:
+        logger.error(f"Cache lock error: {str(e)}", exc_info=True)
+        CACHE_LOCK_WAIT_SECONDS.observe(0, outcome="error")
+        return _fetch_and_store(cache_key, func, isbn, operation)
+
+    if not acquired:
+        try:
+            entry = _wait_for_entry(cache_key, lock_key)
+        except Exception as e:
+            logger.error(f"Cache lock error: {str(e)}", exc_info=True)
+            entry = None
+        if entry is not None:
+            return _resolve(entry)
+        return _fetch_and_store(cache_key, func, isbn, operation)
+
+    CACHE_LOCK_WAIT_SECONDS.observe(0, outcome="acquired")
+    try:
+        return _fetch_and_store(cache_key, func, isbn, operation)
+    finally:
+        _release_lock(lock_key, token)
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    try:
+        # Only release the lock if it has not expired and been re-taken.
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    except Exception as e:
+        logger.error(f"Cache lock error: {str(e)}", exc_info=True)
+
+
+def _revalidate(cache_key: str, func, isbn: str, operation: str) -> None:
+    """
+    Refreshes a stale entry in the background.
+
+    Failures keep the stale entry in place until its hard expiry rather than
+    replacing good data with a negative entry.
+    """
+    lock_key = f"lock:{cache_key}"
+    token = uuid.uuid4().hex
+    acquired = False
+    try:
+        acquired = cache.add(
+            lock_key, token, timeout=getattr(settings, "CACHE_LOCK_TIMEOUT", 10)
+        )
+        if not acquired:
+            # Another worker is already fetching this ISBN.
+            CACHE_REVALIDATIONS.inc(operation=operation, outcome="skipped")
+            return
+
+        try:
+            result = func(isbn)
+        except TransientEnrichmentError as e:
+            logger.warning(f"Could not revalidate ISBN {isbn}: {e}")
+            result = None
+
+        if result and is_valid_enriched_data(result):
+            _store(cache_key, result, operation)
+            CACHE_REVALIDATIONS.inc(operation=operation, outcome="refreshed")
+        else:
+            CACHE_REVALIDATIONS.inc(operation=operation, outcome="failed")
+    except Exception as e:
+        logger.error(f"Cache revalidation error: {str(e)}", exc_info=True)
+        CACHE_REVALIDATIONS.inc(operation=operation, outcome="error")
+    finally:
+        if acquired:
+            _release_lock(lock_key, token)
+        with _revalidating_lock:
+            _revalidating.discard(cache_key)
+
+
+def _schedule_revalidation(cache_key: str, func, isbn: str, operation: str) -> None:
+    """Queues a background refresh of a stale entry, once per key."""
+    with _revalidating_lock:
+        if cache_key in _revalidating:
+            return
+        _revalidating.add(cache_key)
+    logger.info(f"Serving stale data for {cache_key} while revalidating")
+    _revalidation_executor.submit(_revalidate, cache_key, func, isbn, operation)
+
+
 def cache_book_info(func):
-    """Decorator to cache book information."""
+    """
+    Decorator to cache book information.
+
+    Besides book data, two kinds of negative entries are cached so unknown
+    ISBNs do not hit the external API on every call: "not found" answers for
+    `NEGATIVE_CACHE_TTL` seconds, and transient failures (the wrapped function
+    raised `TransientEnrichmentError`) for the shorter `TRANSIENT_FAILURE_TTL`.
+    Both are returned to callers as None.
+
+    Concurrent misses for the same ISBN are coalesced: within a process they
+    share one call, and across workers a lock lets only one of them fetch.
+
+    When `CACHE_STALE_WHILE_REVALIDATE` is enabled, book data past its soft
+    expiry (`CACHE_SOFT_TTL`) is still returned immediately while a background
+    refresh is scheduled; only entries past the hard `CACHE_TTL` block.
+
+    Callers retrying on their own schedule (enrichment jobs) pass
+    `use_negative=False`: negative entries are then ignored and the function
+    is called, and its outcome cached, right away.
+    """
+    operation = func.__name__
 
     @wraps(func)
-    def wrapper(isbn: str) -> Optional[Dict[str, Any]]:
-        cache_key = f"book:{isbn}"
-        logger.info(f"Checking cache for key: {cache_key}")
+    def wrapper(isbn: str, use_negative: bool = True) -> Optional[Dict[str, Any]]:
+        cache_key = _book_cache_key(isbn)
+        invalidation_listener.ensure_started()
 
         try:
-            redis_client = get_redis_connection("default")
-            logger.info(f"Current Redis keys: {redis_client.keys('*')}")
+            with CACHE_LOOKUP_SECONDS.time(operation=operation):
+                entry, stale = _lookup(cache_key, operation)
+        except Exception as e:
+            logger.error(f"Cache error: {str(e)}", exc_info=True)
+            CACHE_REQUESTS.inc(operation=operation, result="error")
+            entry, stale = None, False
 
-            cached_data = cache.get(cache_key)
+        if entry is not None and not use_negative and _negative_reason(entry):
+            # Not coalesced: waiters on the fetch lock would be handed the
+            # negative entry still in the cache.
+            return _fetch_and_store(cache_key, func, isbn, operation)
 
-            if cached_data is not None:
-                # If cached data is not valid, invalidate the cache
-                if not is_valid_enriched_data(cached_data):
-                    logger.warning(
-                        f"Invalid cached data found for ISBN {isbn}. Invalidating cache."
-                    )
-                    cache.delete(cache_key)
-                    redis_client.delete(f"direct:{cache_key}")
-                    cached_data = None
-                else:
-                    logger.info(f"Cache HIT for {cache_key}")
-                    return cached_data
-
-            logger.info(f"Cache MISS for {cache_key}. Fetching data from API.")
-            result = func(isbn)
+        if entry is not None:
+            if stale:
+                _schedule_revalidation(cache_key, func, isbn, operation)
+            return _resolve(entry)
+
+        result, shared = _single_flight.do(
+            cache_key, lambda: _load(cache_key, func, isbn, operation)
+        )
+        if shared:
+            CACHE_COALESCED_REQUESTS.inc(operation=operation)
+            return copy.deepcopy(result)
+        return result
+
+    return wrapper
+
+
+# Background refreshes started by `async_cache_book_info`, referenced until done
+_revalidation_tasks: Set["asyncio.Task"] = set()
+
+
+def _in_thread(func):
+    """Runs blocking cache I/O in a worker thread, off the event loop."""
+    return sync_to_async(func, thread_sensitive=False)
+
+
+async def _afetch_and_store(
+    cache_key: str, func, isbn: str, operation: str
+) -> Optional[Dict[str, Any]]:
+    """Async counterpart of `_fetch_and_store`."""
+    logger.info(f"Cache MISS for {cache_key}. Fetching data from API.")
+    try:
+        result = await func(isbn)
+    except TransientEnrichmentError as e:
+        logger.warning(f"Enrichment unavailable for ISBN {isbn}: {e}")
+        await _in_thread(_store)(
+            cache_key, {NEGATIVE_CACHE_MARKER: UNAVAILABLE}, operation
+        )
+        return None
+
+    if result is None:
+        logger.info(f"No data found for ISBN {isbn}. Caching negative result.")
+        await _in_thread(_store)(
+            cache_key, {NEGATIVE_CACHE_MARKER: NOT_FOUND}, operation
+        )
+    elif is_valid_enriched_data(result):
+        logger.info(f"Caching valid data for ISBN {isbn}")
+        await _in_thread(_store)(cache_key, result, operation)
+    else:
+        logger.warning(f"Invalid or empty data received for ISBN {isbn}. Not caching.")
+    return result
 
-            if result and is_valid_enriched_data(result):
-                logger.info(f"Caching valid data for ISBN {isbn}")
-                cache.set(
-                    cache_key, result, timeout=getattr(settings, "CACHE_TTL", 86400)
-                )
 
-                verification = cache.get(cache_key)
-                logger.info(
-                    f"Cache verification - Key exists: {verification is not None}"
-                )
+async def _arevalidate(cache_key: str, func, isbn: str, operation: str) -> None:
+    """Async counterpart of `_revalidate`, refreshing a stale entry."""
+    try:
+        try:
+            result = await func(isbn)
+        except TransientEnrichmentError as e:
+            logger.warning(f"Could not revalidate ISBN {isbn}: {e}")
+            result = None
+
+        if result and is_valid_enriched_data(result):
+            await _in_thread(_store)(cache_key, result, operation)
+            CACHE_REVALIDATIONS.inc(operation=operation, outcome="refreshed")
+        else:
+            CACHE_REVALIDATIONS.inc(operation=operation, outcome="failed")
+    except Exception as e:
+        logger.error(f"Cache revalidation error: {str(e)}", exc_info=True)
+        CACHE_REVALIDATIONS.inc(operation=operation, outcome="error")
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(cache_key)
 
-                redis_client.set(f"direct:{cache_key}", json.dumps(result), ex=86400)
 
-                logger.info(f"After caching - Redis keys: {redis_client.keys('*')}")
-            else:
-                logger.warning(
-                    f"Invalid or empty data received for ISBN {isbn}. Not caching."
-                )
+def async_cache_book_info(func):
+    """
+    Async counterpart of `cache_book_info` for coroutine functions.
+
+    Reads and writes the same cache entries as `cache_book_info`, with the
+    same negative caching and stale-while-revalidate behaviour. Cache I/O runs
+    in worker threads so the event loop never blocks on Redis.
+
+    Concurrent misses for the same ISBN within an event loop share one call.
+    The cross-worker fetch lock is not taken, since waiting on it would hold
+    up the caller; stale entries are refreshed by a background task.
+    """
+    operation = func.__name__
+    in_flight: Dict[str, "asyncio.Task"] = {}
+
+    def _forget(cache_key: str, task: "asyncio.Task") -> None:
+        if in_flight.get(cache_key) is task:
+            del in_flight[cache_key]
 
-            return result
+    @wraps(func)
+    async def wrapper(isbn: str) -> Optional[Dict[str, Any]]:
+        cache_key = _book_cache_key(isbn)
+        invalidation_listener.ensure_started()
 
+        try:
+            with CACHE_LOOKUP_SECONDS.time(operation=operation):
+                entry, stale = await _in_thread(_lookup)(cache_key, operation)
         except Exception as e:
             logger.error(f"Cache error: {str(e)}", exc_info=True)
-            return func(isbn)
+            CACHE_REQUESTS.inc(operation=operation, result="error")
+            entry, stale = None, False
+
+        if entry is not None:
+            if stale:
+                with _revalidating_lock:
+                    start = cache_key not in _revalidating
+                    _revalidating.add(cache_key)
+                if start:
+                    logger.info(
+                        f"Serving stale data for {cache_key} while revalidating"
+                    )
+                    task = asyncio.ensure_future(
+                        _arevalidate(cache_key, func, isbn, operation)
+                    )
+                    _revalidation_tasks.add(task)
+                    task.add_done_callback(_revalidation_tasks.discard)
+            return _resolve(entry)
+
+        loop = asyncio.get_running_loop()
+        task = in_flight.get(cache_key)
+        shared = task is not None and task.get_loop() is loop
+        if not shared:
+            task = asyncio.ensure_future(
+                _afetch_and_store(cache_key, func, isbn, operation)
+            )
+            in_flight[cache_key] = task
+            task.add_done_callback(lambda done: _forget(cache_key, done))
+        # Shielded so a cancelled caller does not cancel the others' fetch.
+        result = await asyncio.shield(task)
+        if shared:
+            CACHE_COALESCED_REQUESTS.inc(operation=operation)
+            return copy.deepcopy(result)
+        return result
 
     return wrapper
+
+
+def invalidate_book_info(isbn: str) -> None:
+    """
+    Drops the cached information of an ISBN from every cache tier.
+
+    The in-process tier of all other workers is evicted through a Redis
+    pub/sub broadcast.
+    """
+    cache_key = _book_cache_key(isbn)
+    try:
+        cache.delete(cache_key)
+        get_redis_connection("default").delete(f"direct:{cache_key}")
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+    broadcast_invalidation(book_info_local_cache.name, cache_key)
+
+
+COLLECTION_VERSION_KEY = "books:collection:version"
+
+
+def get_collection_version() -> int:
+    """
+    Returns the current version of the book collection.
+
+    Caches derived from the whole collection (autocomplete results, list
+    responses...) embed this version in their keys, so bumping it invalidates
+    all of them in O(1) without scanning keys.
+    """
+    # Seeded from the clock so a lost key never reuses an old version.
+    return cache.get_or_set(COLLECTION_VERSION_KEY, time.time_ns() // 1000, None)
+
+
+def bump_collection_version() -> None:
+    """Marks every collection-derived cache entry as outdated."""
+    try:
+        try:
+            cache.incr(COLLECTION_VERSION_KEY)
+        except ValueError:
+            cache.add(COLLECTION_VERSION_KEY, time.time_ns() // 1000, None)
+    except Exception as e:
+        logger.error(f"Could not bump collection version: {e}", exc_info=True)
@@ -1,15 +1,228 @@
+import asyncio
 import logging
 import os
+import threading
+import weakref
 from typing import Any, Dict, Optional
 
+import httpx
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
-from .cache import cache_book_info
+from .cache import async_cache_book_info, cache_book_info
+from .exceptions import TransientEnrichmentError
+from .profiling import HTTP, timed
+from .rate_limit import TokenBucketLimiter
+from .resilience import CircuitBreaker, acall_with_retries, call_with_retries
 
 logger = logging.getLogger(__name__)
 
 
+def get_google_books_breaker() -> CircuitBreaker:
+    """
+    Returns the breaker failing enrichment fast while Google Books is down.
+
+    Its state lives in the cache and is shared by every worker, so it is
+    built on each call, with the thresholds of the current settings.
+    """
+    return CircuitBreaker(
+        "google_books",
+        failure_threshold=getattr(settings, "GOOGLE_BOOKS_BREAKER_FAILURES", 5),
+        window=getattr(settings, "GOOGLE_BOOKS_BREAKER_WINDOW", 60),
+        recovery_timeout=getattr(settings, "GOOGLE_BOOKS_BREAKER_RECOVERY", 30),
+    )
+
+
+def get_google_books_limiter() -> TokenBucketLimiter:
+    """
+    Returns the limiter keeping every worker within the Google Books quota.
+
+    Like the breaker, its bucket lives in Redis and it is built on each call
+    with the rates of the current settings.
+    """
+    return TokenBucketLimiter(
+        "google_books",
+        rate=getattr(settings, "GOOGLE_BOOKS_RATE_LIMIT", 10),
+        burst=getattr(settings, "GOOGLE_BOOKS_RATE_LIMIT_BURST", 20),
+        reserved=getattr(settings, "GOOGLE_BOOKS_RATE_LIMIT_RESERVED", 5),
+        max_wait=getattr(settings, "GOOGLE_BOOKS_RATE_LIMIT_MAX_WAIT", 30),
+    )
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide HTTP session used to call Google Books.
+
+    Reusing one session keeps TCP/TLS connections alive between requests
+    instead of performing a new handshake for every ISBN. The pool is sized
+    by `GOOGLE_BOOKS_POOL_SIZE` so concurrent threads can share it.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = getattr(settings, "GOOGLE_BOOKS_POOL_SIZE", 10)
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size, pool_maxsize=pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+# One client per event loop, since httpx connections are bound to their loop
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Returns the async HTTP client used to call Google Books from this event loop.
+
+    The client keeps up to `GOOGLE_BOOKS_ASYNC_POOL_SIZE` connections open, so
+    a single worker can have that many requests in flight.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        pool_size = getattr(settings, "GOOGLE_BOOKS_ASYNC_POOL_SIZE", 100)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            timeout=httpx.Timeout(
+                getattr(settings, "GOOGLE_BOOKS_READ_TIMEOUT", 10),
+                connect=getattr(settings, "GOOGLE_BOOKS_CONNECT_TIMEOUT", 3.05),
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_http_client() -> None:
+    """Closes this event loop's client, e.g. before the loop shuts down."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _parse_volume(isbn: str, data: Any) -> Optional[Dict[str, Any]]:
+    """Extracts the enriched fields from a Google Books search response."""
+    if not data.get("totalItems", 0) or "items" not in data:
+        return None
+
+    volume_info = data["items"][0]["volumeInfo"]
+    logger.info(f"Successfully retrieved book data for ISBN: {isbn}")
+
+    return {
+        "title": volume_info.get("title"),
+        "subtitle": volume_info.get("subtitle"),
+        "authors": volume_info.get("authors", []),
+        "publisher": volume_info.get("publisher"),
+        "published_date": volume_info.get("publishedDate"),
+        "description": volume_info.get("description"),
+        "page_count": volume_info.get("pageCount"),
+        "categories": volume_info.get("categories", []),
+        "average_rating": volume_info.get("averageRating"),
+        "ratings_count": volume_info.get("ratingsCount"),
+        "language": volume_info.get("language"),
+        "preview_link": volume_info.get("previewLink"),
+        "info_link": volume_info.get("infoLink"),
+        "image_links": volume_info.get("imageLinks", {}),
+    }
+
+
+def _is_transient_status(status_code: Optional[int]) -> bool:
+    """
+    Returns whether a failed Google Books response may succeed when retried.
+
+    Lookups of unknown ISBNs succeed with no items, so only a 404 is an
+    answer about the ISBN itself. Other client errors come from the request
+    or the account, e.g. exceeded quotas (403), timeouts (408), rate limiting
+    (429) or a bad or rotated key (400), and must not be cached as "not found".
+    """
+    return status_code != 404
+
+
+def _request_volume(isbn: str) -> Optional[Dict[str, Any]]:
+    """Makes one Google Books request, see `BookEnrichmentService.get_book_info`."""
+    get_google_books_limiter().acquire()
+    try:
+        logger.info(f"Making API request for ISBN: {isbn}")
+        params = {"q": f"isbn:{isbn}"}
+        with timed(HTTP):
+            response = get_http_session().get(
+                BookEnrichmentService.GOOGLE_BOOKS_API_URL,
+                params=params,
+                timeout=(
+                    getattr(settings, "GOOGLE_BOOKS_CONNECT_TIMEOUT", 3.05),
+                    getattr(settings, "GOOGLE_BOOKS_READ_TIMEOUT", 10),
+                ),
+            )
+        response.raise_for_status()
+
+        try:
+            data = response.json()
+            logger.info("Successfully parsed API response")
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error parsing JSON response: {e}")
+            raise TransientEnrichmentError("Malformed Google Books response") from e
+        return _parse_volume(isbn, data)
+
+    except requests.HTTPError as e:
+        logger.error(f"Error fetching book information: {e}")
+        status_code = e.response.status_code if e.response is not None else None
+        if _is_transient_status(status_code):
+            raise TransientEnrichmentError(str(e)) from e
+        return None
+    except requests.RequestException as e:
+        logger.error(f"Error fetching book information: {e}")
+        raise TransientEnrichmentError(str(e)) from e
+    except (KeyError, IndexError) as e:
+        logger.error(f"Error processing book data: {e}")
+        return None
+
+
+async def _arequest_volume(isbn: str) -> Optional[Dict[str, Any]]:
+    """Async version of `_request_volume`, using the event loop's client."""
+    await get_google_books_limiter().aacquire()
+    try:
+        logger.info(f"Making API request for ISBN: {isbn}")
+        with timed(HTTP):
+            response = await get_async_http_client().get(
+                BookEnrichmentService.GOOGLE_BOOKS_API_URL,
+                params={"q": f"isbn:{isbn}"},
+            )
+        response.raise_for_status()
+
+        try:
+            data = response.json()
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error parsing JSON response: {e}")
+            raise TransientEnrichmentError("Malformed Google Books response") from e
+        return _parse_volume(isbn, data)
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Error fetching book information: {e}")
+        if _is_transient_status(e.response.status_code):
+            raise TransientEnrichmentError(str(e)) from e
+        return None
+    except httpx.HTTPError as e:
+        logger.error(f"Error fetching book information: {e}")
+        raise TransientEnrichmentError(str(e)) from e
+    except (KeyError, IndexError) as e:
+        logger.error(f"Error processing book data: {e}")
+        return None
+
+
 class BookEnrichmentService:
     """Service for enriching book data using Google Books API."""
 
@@ -26,47 +239,32 @@ class BookEnrichmentService:
 
         Returns:
             Dict with book information or None if not found
+
+        Raises:
+            TransientEnrichmentError: if Google Books failed in a way that may
+                succeed on retry (network error, timeout, non-404 HTTP error)
         """
-        try:
-            logger.info(f"Making API request for ISBN: {isbn}")
-            params = {"q": f"isbn:{isbn}"}
-            response = requests.get(
-                BookEnrichmentService.GOOGLE_BOOKS_API_URL, params=params
-            )
-            response.raise_for_status()
-
-            try:
-                data = response.json()
-                logger.info("Successfully parsed API response")
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error parsing JSON response: {e}")
-                return None
-            if not data.get("totalItems", 0) or "items" not in data:
-                return None
-
-            volume_info = data["items"][0]["volumeInfo"]
-            logger.info(f"Successfully retrieved book data for ISBN: {isbn}")
-
-            return {
-                "title": volume_info.get("title"),
-                "subtitle": volume_info.get("subtitle"),
-                "authors": volume_info.get("authors", []),
-                "publisher": volume_info.get("publisher"),
-                "published_date": volume_info.get("publishedDate"),
-                "description": volume_info.get("description"),
-                "page_count": volume_info.get("pageCount"),
-                "categories": volume_info.get("categories", []),
-                "average_rating": volume_info.get("averageRating"),
-                "ratings_count": volume_info.get("ratingsCount"),
-                "language": volume_info.get("language"),
-                "preview_link": volume_info.get("previewLink"),
-                "info_link": volume_info.get("infoLink"),
-                "image_links": volume_info.get("imageLinks", {}),
-            }
-
-        except requests.RequestException as e:
-            logger.error(f"Error fetching book information: {e}")
-            return None
-        except (KeyError, IndexError) as e:
-            logger.error(f"Error processing book data: {e}")
-            return None
+        return call_with_retries(get_google_books_breaker(), _request_volume, isbn)
+
+    @staticmethod
+    @async_cache_book_info
+    async def aget_book_info(isbn: str) -> Optional[Dict[str, Any]]:
+        """
+        Async version of `get_book_info`, sharing its cache entries.
+
+        Uses the event loop's pooled `httpx.AsyncClient`, so many lookups can
+        be awaited concurrently without a thread per request.
+
+        Args:
+            isbn: Book ISBN
+
+        Returns:
+            Dict with book information or None if not found
+
+        Raises:
+            TransientEnrichmentError: if Google Books failed in a way that may
+                succeed on retry (network error, timeout, non-404 HTTP error)
+        """
+        return await acall_with_retries(
+            get_google_books_breaker(), _arequest_volume, isbn
+        )
@@ -0,0 +1,18 @@
+class EnrichmentError(Exception):
+    """Base class for errors raised while enriching book data."""
+
+
+class TransientEnrichmentError(EnrichmentError):
+    """
+    Google Books could not answer right now (timeout, quota, 5xx...).
+
+    Unlike an unknown ISBN, the same request may succeed if retried later.
+    """
+
+
+class CircuitOpenError(TransientEnrichmentError):
+    """Google Books was not called because its circuit breaker is open."""
+
+
+class RateLimitedError(TransientEnrichmentError):
+    """Google Books was not called because the shared rate limit was exhausted."""
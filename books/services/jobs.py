@@ -0,0 +1,153 @@
+import logging
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import Book, EnrichmentJob
+from .cache import bump_collection_version
+from .enrichment import BookEnrichmentService
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_enrichment(book: Book) -> EnrichmentJob:
+    """
+    Schedules a book for enrichment by the background workers.
+
+    A book has at most one queued job at a time, so repeated updates before a
+    worker picks the job up collapse into a single Google Books request.
+
+    Args:
+        book: Book model instance
+
+    Returns:
+        The queued EnrichmentJob
+    """
+    job, created = EnrichmentJob.objects.get_or_create(
+        book=book, status=EnrichmentJob.Status.QUEUED
+    )
+    if created:
+        logger.info(f"Queued enrichment job {job.pk} for ISBN {book.isbn}")
+    return job
+
+
+def enqueue_enrichment_many(book_ids: Iterable[int]) -> None:
+    """
+    Schedules many books for enrichment with a single insert.
+
+    Books that already have a queued job are skipped, relying on the
+    `unique_queued_enrichment_job` constraint.
+
+    Args:
+        book_ids: Primary keys of the books to enrich
+    """
+    jobs = [EnrichmentJob(book_id=book_id) for book_id in book_ids]
+    EnrichmentJob.objects.bulk_create(jobs, ignore_conflicts=True)
+    if jobs:
+        logger.info(f"Queued enrichment of {len(jobs)} book(s)")
+
+
+def claim_enrichment_jobs(limit: int) -> List[EnrichmentJob]:
+    """
+    Claims up to `limit` runnable jobs for the calling worker.
+
+    Rows are locked with `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent
+    workers never block on, or claim, each other's jobs. Jobs left running by a
+    crashed worker become claimable again once their lease expires.
+
+    Args:
+        limit: Maximum number of jobs to claim
+
+    Returns:
+        List of claimed jobs, with their books loaded
+    """
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=settings.ENRICHMENT_JOB_LEASE)
+
+    with transaction.atomic():
+        job_ids = list(
+            EnrichmentJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=EnrichmentJob.Status.QUEUED, run_after__lte=now)
+                | Q(status=EnrichmentJob.Status.RUNNING, locked_at__lt=lease_expired)
+            )
+            .order_by("run_after")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if not job_ids:
+            return []
+        EnrichmentJob.objects.filter(pk__in=job_ids).update(
+            status=EnrichmentJob.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+
+    return list(
+        EnrichmentJob.objects.select_related("book")
+        .filter(pk__in=job_ids)
+        .order_by("run_after")
+    )
+
+
+def process_enrichment_job(job: EnrichmentJob) -> bool:
+    """
+    Runs a claimed job: fetches enriched data and stores it on the book.
+
+    Failed jobs are retried with a linear backoff until
+    `ENRICHMENT_JOB_MAX_ATTEMPTS` is reached, then marked as failed.
+
+    Args:
+        job: A job returned by `claim_enrichment_jobs`
+
+    Returns:
+        bool indicating if enrichment was successful
+    """
+    book = job.book
+    try:
+        # Retries are spaced by the job's own backoff, so an earlier "not
+        # found" or failure answer cached for the ISBN must not stand in for
+        # a new request.
+        enriched_data = BookEnrichmentService.get_book_info(
+            book.isbn, use_negative=False
+        )
+    except Exception as e:
+        logger.error(f"Enrichment job {job.pk} crashed: {e}", exc_info=True)
+        enriched_data = None
+        job.last_error = str(e)
+    else:
+        job.last_error = "" if enriched_data else "No data returned by Google Books"
+
+    if enriched_data:
+        book.update_enriched_data(enriched_data)
+        job.delete()
+        return True
+
+    if job.attempts >= settings.ENRICHMENT_JOB_MAX_ATTEMPTS:
+        logger.warning(
+            f"Giving up on enrichment for ISBN {book.isbn} after {job.attempts} attempts"
+        )
+        job.status = EnrichmentJob.Status.FAILED
+        job.save(update_fields=["status", "last_error"])
+        Book.objects.filter(pk=book.pk).update(
+            enrichment_status=Book.EnrichmentStatus.FAILED, updated_at=timezone.now()
+        )
+        # update() sends no signals, so invalidate collection caches here.
+        bump_collection_version()
+        return False
+
+    job.status = EnrichmentJob.Status.QUEUED
+    job.locked_at = None
+    job.run_after = timezone.now() + timedelta(
+        seconds=settings.ENRICHMENT_JOB_RETRY_DELAY * job.attempts
+    )
+    try:
+        with transaction.atomic():
+            job.save(update_fields=["status", "locked_at", "run_after", "last_error"])
+    except IntegrityError:
+        # The book was updated meanwhile and already has a fresh queued job.
+        job.delete()
+    return False
@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE_EVICTIONS = Counter(
+    "books_local_cache_evictions_total",
+    "Entries dropped from in-process caches by reason "
+    "(capacity, expired, invalidated).",
+    ["cache", "reason"],
+)
+
+_MISSING = object()
+
+# All in-process caches by name, so invalidation messages can find them.
+_caches: Dict[str, "LocalCache"] = {}
+
+
+class LocalCache:
+    """
+    Thread-safe, size-bounded LRU cache with a per-entry TTL.
+
+    Used as a first tier in front of Redis for the hottest keys. Entries are
+    evicted when the cache is full (least recently used first), when they
+    expire, or when another worker broadcasts an invalidation.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                LOCAL_CACHE_EVICTIONS.inc(cache=self.name, reason="expired")
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores a value for `ttl` seconds (capped at the cache's own TTL)."""
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                LOCAL_CACHE_EVICTIONS.inc(cache=self.name, reason="capacity")
+
+    def delete(self, key: str, reason: str = "invalidated") -> bool:
+        with self._lock:
+            if self._entries.pop(key, _MISSING) is _MISSING:
+                return False
+        LOCAL_CACHE_EVICTIONS.inc(cache=self.name, reason=reason)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _uses_redis() -> bool:
+    return "django_redis" in settings.CACHES["default"]["BACKEND"]
+
+
+class InvalidationListener:
+    """
+    Background thread evicting local entries invalidated by other workers.
+
+    Messages are published on `CACHE_INVALIDATION_CHANNEL` by
+    `broadcast_invalidation`. Local caches are cleared whenever the listener
+    (re)connects, since messages sent while it was disconnected are lost.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def ensure_started(self) -> None:
+        # Threads do not survive a fork, so track the owning process.
+        if self._pid == os.getpid() or not _uses_redis():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            thread = threading.Thread(
+                target=self._run, name="cache-invalidation-listener", daemon=True
+            )
+            thread.start()
+
+    def _run(self) -> None:
+        channel = settings.CACHE_INVALIDATION_CHANNEL
+        while True:
+            try:
+                pubsub = get_redis_connection("default").pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(channel)
+                for local_cache in list(_caches.values()):
+                    local_cache.clear()
+                for message in pubsub.listen():
+                    self._handle(message)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                time.sleep(1)
+
+    @staticmethod
+    def _handle(message: Dict[str, Any]) -> None:
+        try:
+            payload = json.loads(message["data"])
+            local_cache = _caches.get(payload["cache"])
+            if local_cache is not None:
+                local_cache.delete(payload["key"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed invalidation message: {e}")
+
+
+invalidation_listener = InvalidationListener()
+
+
+def broadcast_invalidation(cache_name: str, key: str) -> None:
+    """Evicts `key` from the named local cache in this and every other worker."""
+    local_cache = _caches.get(cache_name)
+    if local_cache is not None:
+        local_cache.delete(key)
+    if not _uses_redis():
+        return
+    try:
+        get_redis_connection("default").publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"cache": cache_name, "key": key}),
+        )
+    except Exception as e:
+        logger.error(f"Could not broadcast invalidation of {key}: {e}")
@@ -0,0 +1,97 @@
+"""
+Per-request accounting of the time spent in SQL, cache and outbound HTTP calls.
+
+`RequestProfilingMiddleware` activates a `RequestProfile` for each request;
+the hooks below add to it from whatever thread or task serves the request
+(context variables follow `sync_to_async` and asyncio tasks), and do nothing
+outside of a request.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from redis.connection import Connection, ConnectionPool
+
+SQL = "sql"
+CACHE = "cache"
+HTTP = "http"
+
+
+class RequestProfile:
+    """Call counts and durations (in seconds) by kind of call."""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {SQL: 0, CACHE: 0, HTTP: 0}
+        self.durations: Dict[str, float] = {SQL: 0.0, CACHE: 0.0, HTTP: 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, duration: float, calls: int = 1) -> None:
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + calls
+            self.durations[kind] = self.durations.get(kind, 0.0) + duration
+
+
+_current: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar(
+    "request_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def activate(profile: Optional[RequestProfile]) -> contextvars.Token:
+    return _current.set(profile)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def timed(kind: str, calls: int = 1) -> Iterator[None]:
+    """Adds the duration of the block to the current request's profile."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(kind, time.perf_counter() - started, calls)
+
+
+def sql_execute_wrapper(execute, sql, params, many, context) -> Any:
+    """Database execute wrapper timing every query, installed on connections."""
+    with timed(SQL):
+        return execute(sql, params, many, context)
+
+
+class ProfiledConnection(Connection):
+    """Redis connection timing each round trip (a pipeline counts as one)."""
+
+    def send_packed_command(self, command, check_health=True):
+        with timed(CACHE):
+            return super().send_packed_command(command, check_health)
+
+    def read_response(self, *args, **kwargs):
+        with timed(CACHE, calls=0):
+            return super().read_response(*args, **kwargs)
+
+
+class ProfiledConnectionPool(ConnectionPool):
+    """
+    Connection pool handing out `ProfiledConnection`s.
+
+    Set as the django-redis `CONNECTION_POOL_CLASS`, so both the Django cache
+    and the raw connections from `get_redis_connection` are accounted for.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        if kwargs.get("connection_class", Connection) is Connection:
+            kwargs["connection_class"] = ProfiledConnection
+        super().__init__(*args, **kwargs)
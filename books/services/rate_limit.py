@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+from typing import Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django_redis import get_redis_connection
+
+from .exceptions import RateLimitedError
+from .local_cache import _uses_redis
+from .metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "books_rate_limit_wait_seconds",
+    "Time outbound calls waited for a rate limiter token, by priority.",
+    ["name", "priority"],
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# Priority of the outbound calls made by the current request or task
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "enrichment_priority", default=BACKGROUND
+)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def enrichment_priority(priority: str) -> Iterator[None]:
+    """Runs the block's outbound calls with the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# Refills the bucket for the time elapsed since the last call (using the
+# Redis clock, so workers agree on it), then takes a token if at least
+# `floor` would remain. Returns 0, or the milliseconds until a token is free.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local floor = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local wait = 0
+if tokens - 1 >= floor then
+    tokens = tokens - 1
+else
+    wait = math.ceil((floor + 1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return wait
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket shared by every worker through Redis.
+
+    Allows `rate` calls per second on average, with bursts of up to `burst`.
+    The last `reserved` tokens can only be taken by interactive callers, so
+    user-facing calls go first when background work saturates the bucket.
+    Waiting callers poll until a token is free, for at most `max_wait`
+    seconds. Redis errors let calls through. Disabled when `rate` is 0 or
+    the cache is not Redis.
+    """
+
+    _script = None
+
+    def __init__(
+        self, name: str, rate: float, burst: int, reserved: int, max_wait: float
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.reserved = min(reserved, self.burst - 1)
+        self.max_wait = max_wait
+        self._key = f"ratelimit:{name}"
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and _uses_redis()
+
+    def _take(self, priority: str) -> float:
+        """Takes a token, or returns the seconds to wait before trying again."""
+        try:
+            connection = get_redis_connection("default")
+            if TokenBucketLimiter._script is None:
+                TokenBucketLimiter._script = connection.register_script(
+                    TOKEN_BUCKET_SCRIPT
+                )
+            floor = 0 if priority == INTERACTIVE else self.reserved
+            wait_ms = self._script(
+                keys=[self._key],
+                args=[self.rate, self.burst, floor],
+                client=connection,
+            )
+        except Exception as e:
+            logger.error(f"Rate limiter error: {str(e)}", exc_info=True)
+            return 0.0
+        return int(wait_ms) / 1000
+
+    def _timed_out(self, waited: float, delay: float) -> bool:
+        return waited + delay > self.max_wait
+
+    def _reject(self, priority: str, waited: float) -> RateLimitedError:
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, name=self.name, priority=priority)
+        return RateLimitedError(
+            f"No {self.name} rate limit token within {self.max_wait}s"
+        )
+
+    def acquire(self, priority: Optional[str] = None) -> float:
+        """
+        Blocks until a token is taken, returning the seconds waited.
+
+        Raises:
+            RateLimitedError: if no token is free within `max_wait` seconds
+        """
+        if not self.enabled:
+            return 0.0
+        priority = priority or current_priority()
+        started = time.monotonic()
+        while True:
+            delay = self._take(priority)
+            waited = time.monotonic() - started
+            if not delay:
+                break
+            if self._timed_out(waited, delay):
+                raise self._reject(priority, waited)
+            time.sleep(delay)
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, name=self.name, priority=priority)
+        return waited
+
+    async def aacquire(self, priority: Optional[str] = None) -> float:
+        """Async version of `acquire`, waiting without blocking the event loop."""
+        if not self.enabled:
+            return 0.0
+        priority = priority or current_priority()
+        take = sync_to_async(self._take, thread_sensitive=False)
+        started = time.monotonic()
+        while True:
+            delay = await take(priority)
+            waited = time.monotonic() - started
+            if not delay:
+                break
+            if self._timed_out(waited, delay):
+                raise self._reject(priority, waited)
+            await asyncio.sleep(delay)
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, name=self.name, priority=priority)
+        return waited
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .exceptions import CircuitOpenError, RateLimitedError, TransientEnrichmentError
+from .metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "books_circuit_breaker_state",
+    "Last circuit breaker state seen by this process "
+    "(0 closed, 1 half-open, 2 open).",
+    ["name"],
+)
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    "books_circuit_breaker_rejections_total",
+    "Calls failed fast because the circuit breaker was open.",
+    ["name"],
+)
+UPSTREAM_RETRIES = Counter(
+    "books_upstream_retries_total",
+    "Upstream calls retried after a transient failure.",
+    ["name"],
+)
+
+CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker whose state is shared by every worker through the cache.
+
+    After `failure_threshold` failures within `window` seconds the circuit
+    opens and calls fail fast for `recovery_timeout` seconds. Then a single
+    caller (across all workers) is let through as a probe: its success closes
+    the circuit, its failure opens it again. Any success resets the failure
+    count. Cache errors never block calls.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        window: int,
+        recovery_timeout: int,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self._open_key = f"circuit:{name}:open_until"
+        self._failures_key = f"circuit:{name}:failures"
+        self._probe_key = f"circuit:{name}:probe"
+
+    def _set_state(self, state: int) -> None:
+        CIRCUIT_BREAKER_STATE.set(state, name=self.name)
+
+    def allow(self) -> bool:
+        """Returns whether a call may go through now."""
+        try:
+            open_until = cache.get(self._open_key)
+            if open_until is None:
+                self._set_state(CLOSED)
+                return True
+            if time.time() < open_until:
+                self._set_state(OPEN)
+                return False
+            # Recovery timeout elapsed: let one caller probe the upstream.
+            # The probe key expires in case the prober dies without reporting.
+            self._set_state(HALF_OPEN)
+            return cache.add(self._probe_key, 1, timeout=self.recovery_timeout)
+        except Exception as e:
+            logger.error(f"Cache error: {str(e)}", exc_info=True)
+            return True
+
+    def record_success(self) -> None:
+        try:
+            cache.delete_many([self._open_key, self._failures_key, self._probe_key])
+        except Exception as e:
+            logger.error(f"Cache error: {str(e)}", exc_info=True)
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        try:
+            if cache.get(self._open_key) is not None:
+                # The half-open probe failed
+                self._open()
+                return
+            cache.add(self._failures_key, 0, timeout=self.window)
+            if cache.incr(self._failures_key) >= self.failure_threshold:
+                self._open()
+        except Exception as e:
+            logger.error(f"Cache error: {str(e)}", exc_info=True)
+
+    def _open(self) -> None:
+        logger.warning(
+            f"Circuit breaker {self.name} opened for {self.recovery_timeout}s"
+        )
+        cache.set(self._open_key, time.time() + self.recovery_timeout, timeout=None)
+        cache.delete_many([self._failures_key, self._probe_key])
+        self._set_state(OPEN)
+
+
+def backoff_delays(
+    retries: int, base_delay: float, max_delay: float
+) -> Iterator[float]:
+    """Yields `retries` exponential backoff delays with full jitter."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+def _reject(breaker: CircuitBreaker) -> CircuitOpenError:
+    CIRCUIT_BREAKER_REJECTIONS.inc(name=breaker.name)
+    return CircuitOpenError(f"Circuit breaker {breaker.name} is open")
+
+
+def _retry_settings() -> tuple:
+    return (
+        getattr(settings, "GOOGLE_BOOKS_MAX_RETRIES", 2),
+        getattr(settings, "GOOGLE_BOOKS_RETRY_BASE_DELAY", 0.1),
+        getattr(settings, "GOOGLE_BOOKS_RETRY_MAX_DELAY", 2.0),
+    )
+
+
+def call_with_retries(
+    breaker: CircuitBreaker, func: Callable[..., Any], *args: Any
+) -> Any:
+    """
+    Calls `func` through the circuit breaker, retrying transient failures.
+
+    Retries are bounded by `GOOGLE_BOOKS_MAX_RETRIES` and spaced by jittered
+    exponential backoff. A call failing on every attempt counts as a single
+    failure for the breaker.
+
+    Raises:
+        CircuitOpenError: if the circuit is open
+        TransientEnrichmentError: if every attempt failed
+    """
+    if not breaker.allow():
+        raise _reject(breaker)
+    delays = backoff_delays(*_retry_settings())
+    while True:
+        try:
+            result = func(*args)
+        except RateLimitedError:
+            # The upstream was not called, so its health is unknown
+            raise
+        except TransientEnrichmentError:
+            delay = next(delays, None)
+            if delay is None:
+                breaker.record_failure()
+                raise
+            UPSTREAM_RETRIES.inc(name=breaker.name)
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+async def acall_with_retries(
+    breaker: CircuitBreaker, func: Callable[..., Awaitable[Any]], *args: Any
+) -> Any:
+    """Async version of `call_with_retries`, keeping cache I/O off the loop."""
+    if not await sync_to_async(breaker.allow, thread_sensitive=False)():
+        raise _reject(breaker)
+    delays = backoff_delays(*_retry_settings())
+    while True:
+        try:
+            result = await func(*args)
+        except RateLimitedError:
+            # The upstream was not called, so its health is unknown
+            raise
+        except TransientEnrichmentError:
+            delay = next(delays, None)
+            if delay is None:
+                await sync_to_async(breaker.record_failure, thread_sensitive=False)()
+                raise
+            UPSTREAM_RETRIES.inc(name=breaker.name)
+            await asyncio.sleep(delay)
+            continue
+        await sync_to_async(breaker.record_success, thread_sensitive=False)()
+        return result
@@ -0,0 +1,176 @@
+import copy
+import logging
+import uuid
+from typing import Any, Dict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .local_cache import LocalCache, broadcast_invalidation, invalidation_listener
+from .metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_REQUESTS = Counter(
+    "books_user_cache_requests_total",
+    "Authenticated user lookups by result (local_hit, hit, miss, error).",
+    ["result"],
+)
+
+# In-process tier in front of Redis, kept short since it is only evicted by
+# broadcasts and a fill racing with an invalidation survives until it expires
+user_local_cache = LocalCache(
+    "users",
+    max_entries=getattr(settings, "LOCAL_CACHE_MAX_ENTRIES", 1024),
+    ttl=min(
+        getattr(settings, "LOCAL_CACHE_TTL", 60),
+        getattr(settings, "USER_CACHE_TTL", 300),
+    ),
+)
+
+
+# Instance attribute holding the password digest of cached users
+REVOKE_HASH_ATTR = "_cached_revoke_hash"
+
+
+def _user_key(user_id: Any) -> str:
+    return f"users:{user_id}"
+
+
+def _version_key(user_id: Any) -> str:
+    return f"users:{user_id}:version"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def _version_timeout(timeout: int) -> int:
+    # Outlives the entries stamped with the version. An expired version is
+    # only replaced by a new one, which never matches an older entry.
+    return timeout * 2
+
+
+def _to_entry(user: AbstractBaseUser, version: str) -> Dict[str, Any]:
+    """
+    Builds the cache entry of a user.
+
+    The password hash is left out, so it is never copied to Redis; only its
+    digest is kept, for the token revocation check.
+    """
+    return {
+        "version": version,
+        "fields": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        },
+        "revoke_hash": get_md5_hash_password(user.password),
+    }
+
+
+def _from_entry(entry: Dict[str, Any]) -> AbstractBaseUser:
+    """Rebuilds a user from its cache entry, with the password deferred."""
+    fields = entry["fields"]
+    user = get_user_model().from_db(
+        DEFAULT_DB_ALIAS, list(fields), list(fields.values())
+    )
+    user.__dict__[REVOKE_HASH_ATTR] = entry["revoke_hash"]
+    return user
+
+
+def get_revoke_hash(user: AbstractBaseUser) -> str:
+    """
+    Returns the digest of the user's password used to revoke tokens.
+
+    Cached users carry it, since their password is deferred and reading it
+    would query the database.
+    """
+    revoke_hash = user.__dict__.get(REVOKE_HASH_ATTR)
+    if revoke_hash is None:
+        revoke_hash = get_md5_hash_password(user.password)
+    return revoke_hash
+
+
+def get_cached_user(user_id: Any) -> AbstractBaseUser:
+    """
+    Returns the user with the given primary key, from cache when possible.
+
+    Redis entries carry the user's cache version, read in the same round trip
+    as the entry. `invalidate_cached_user` replaces the version, so an entry
+    filled from a read that raced with a change is never served. Disabled
+    when `USER_CACHE_TTL` is 0.
+
+    Only the user's own columns are cached, without the password hash: the
+    returned user has its password deferred (reading it queries the
+    database) and carries the digest needed by `get_revoke_hash`.
+
+    Entries are invalidated by the `post_save`/`post_delete` signals. Changes
+    that send none, such as `QuerySet.update(is_active=False)`, must call
+    `invalidate_cached_user`, or the user stays authenticated until the entry
+    expires (`USER_CACHE_TTL`).
+
+    Raises:
+        DoesNotExist: if the user does not exist
+    """
+    user_model = get_user_model()
+    timeout = getattr(settings, "USER_CACHE_TTL", 300)
+    if not timeout:
+        return user_model.objects.get(pk=user_id)
+
+    invalidation_listener.ensure_started()
+    key = _user_key(user_id)
+    user = user_local_cache.get(key)
+    if user is not None:
+        USER_CACHE_REQUESTS.inc(result="local_hit")
+        # Each request gets its own instance, so it can be modified safely.
+        return copy.copy(user)
+
+    version_key = _version_key(user_id)
+    try:
+        found = cache.get_many([key, version_key])
+        version = found.get(version_key)
+        if version is None:
+            version = _new_version()
+            if not cache.add(version_key, version, timeout=_version_timeout(timeout)):
+                version = cache.get(version_key, version)
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+        USER_CACHE_REQUESTS.inc(result="error")
+        return user_model.objects.get(pk=user_id)
+
+    entry = found.get(key)
+    if entry is not None and entry["version"] == version:
+        USER_CACHE_REQUESTS.inc(result="hit")
+    else:
+        USER_CACHE_REQUESTS.inc(result="miss")
+        entry = _to_entry(user_model.objects.get(pk=user_id), version)
+        try:
+            cache.set(key, entry, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Cache error: {str(e)}", exc_info=True)
+
+    user = _from_entry(entry)
+    user_local_cache.set(key, user)
+    return copy.copy(user)
+
+
+def invalidate_cached_user(user_id: Any) -> None:
+    """
+    Drops the cached user from every tier of every worker.
+
+    Called by signals on save and delete; call it after changing users in
+    ways that bypass them, e.g. `User.objects.filter(...).update(...)`.
+    """
+    key = _user_key(user_id)
+    timeout = getattr(settings, "USER_CACHE_TTL", 300)
+    try:
+        cache.set(_version_key(user_id), _new_version(), _version_timeout(timeout))
+        cache.delete(key)
+    except Exception as e:
+        logger.error(f"Cache error: {str(e)}", exc_info=True)
+    broadcast_invalidation(user_local_cache.name, key)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Book
+from .services.cache import bump_collection_version
+from .services.profiling import sql_execute_wrapper
+from .services.users import invalidate_cached_user
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def book_changed(sender, **kwargs) -> None:
+    """Invalidates collection-level caches whenever a book changes."""
+    bump_collection_version()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs) -> None:
+    """Drops the cached copy of a user that was changed or deleted."""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(connection_created)
+def profile_queries(sender, connection, **kwargs) -> None:
+    """Times the queries of every connection for the request profiler."""
+    if sql_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_execute_wrapper)
@@ -1,18 +1,80 @@
+import asyncio
+import csv
+import json
 import os
+import pstats
+import tempfile
+import threading
+import time
 from datetime import date
-from unittest.mock import Mock, patch
+from io import StringIO
+from unittest.mock import ANY, AsyncMock, Mock, patch
 
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
-from ..models import Book
-from ..services import BookEnrichmentService, cache_book_info
+from .. import services
+from ..api.response_cache import RESPONSE_CACHE_REQUESTS
+from ..api.serializers import BookSerializer
+from ..api.throttling import THROTTLED_REQUESTS
+from ..api.views import BookViewSet
+from ..models import Book, BookQuerySet, EnrichmentJob
+from ..services import (
+    INTERACTIVE,
+    BookEnrichmentService,
+    CircuitOpenError,
+    RateLimitedError,
+    TransientEnrichmentError,
+    cache_book_info,
+    claim_enrichment_jobs,
+    enqueue_enrichment,
+    process_enrichment_job,
+)
+from ..services.cache import (
+    CACHE_COALESCED_REQUESTS,
+    CACHE_LOCK_WAIT_SECONDS,
+    CACHE_LOOKUP_SECONDS,
+    CACHE_REQUESTS,
+    CACHE_REVALIDATIONS,
+    CACHE_TIER_REQUESTS,
+    book_info_local_cache,
+    invalidate_book_info,
+)
+from ..services.enrichment import get_google_books_breaker, get_google_books_limiter
+from ..services.local_cache import (
+    LOCAL_CACHE_EVICTIONS,
+    InvalidationListener,
+    LocalCache,
+)
+from ..services.metrics import REGISTRY
+from ..services.rate_limit import (
+    RATE_LIMIT_WAIT_SECONDS,
+    TokenBucketLimiter,
+    current_priority,
+)
+from ..services.resilience import (
+    CIRCUIT_BREAKER_REJECTIONS,
+    CIRCUIT_BREAKER_STATE,
+    UPSTREAM_RETRIES,
+)
+from ..services.users import get_revoke_hash, user_local_cache
 
 User = get_user_model()
 
@@ -43,6 +105,13 @@ MOCK_BOOK_API_RESPONSE = {
 }
 
 
+class DenyObjectAccess(IsAuthenticated):
+    """Permission refusing access to every book."""
+
+    def has_object_permission(self, request, view, obj):
+        return False
+
+
 class BookModelTests(TestCase):
     def setUp(self):
         self.book = Book.objects.create(
@@ -75,6 +144,7 @@ class BookAPITests(APITestCase):
     def setUp(self):
         # Clear local test cache
         cache.clear()
+        book_info_local_cache.clear()
         self.user = User.objects.create_user(
             username="testuser", password="testpass123"
         )
@@ -112,6 +182,13 @@ class BookAPITests(APITestCase):
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(response.data["enrichment_status"], "pending")
+        mock_get_book_info.assert_not_called()
+        self.assertTrue(
+            EnrichmentJob.objects.filter(
+                book_id=response.data["id"], status=EnrichmentJob.Status.QUEUED
+            ).exists()
+        )
 
     def test_create_book_invalid_data(self):
         url = reverse("book-list")
@@ -138,6 +215,16 @@ class BookAPITests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+        response = self.client.get(reverse("book-detail", args=["abc"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch.object(BookViewSet, "permission_classes", [DenyObjectAccess])
+    def test_detail_checks_object_permissions(self):
+        url = reverse("book-detail", args=[self.book.id])
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
     def test_update_book(self, mock_get_book_info):
         mock_get_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
@@ -156,6 +243,8 @@ class BookAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.book.refresh_from_db()
         self.assertEqual(self.book.title, "Updated Title")
+        self.assertEqual(self.book.enrichment_status, Book.EnrichmentStatus.PENDING)
+        self.assertEqual(self.book.enrichment_jobs.count(), 1)
 
     def test_delete_book(self):
         url = reverse("book-detail", args=[self.book.id])
@@ -179,6 +268,20 @@ class BookAPITests(APITestCase):
             MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]["title"],
         )
 
+    @patch("requests.Session.get")
+    def test_refresh_enriched_data_bypasses_cache(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = MOCK_BOOK_API_RESPONSE
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        BookEnrichmentService.get_book_info(self.book.isbn)
+        url = reverse("book-refresh-enriched-data", args=[self.book.id])
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_get.call_count, 2)
+
     @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
     def test_refresh_enriched_data_failure(self, mock_get_book_info):
         mock_get_book_info.return_value = None
@@ -198,9 +301,10 @@ class BookAPITests(APITestCase):
 class BookEnrichmentServiceTests(TestCase):
     def setUp(self):
         cache.clear()
+        book_info_local_cache.clear()
         self.isbn = "9780261102217"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_book_info_success(self, mock_get):
         mock_response = Mock()
         mock_response.json.return_value = MOCK_BOOK_API_RESPONSE
@@ -213,7 +317,7 @@ class BookEnrichmentServiceTests(TestCase):
             result["title"], MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]["title"]
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_book_info_no_results(self, mock_get):
         mock_response = Mock()
         mock_response.json.return_value = {"totalItems": 0}
@@ -223,13 +327,13 @@ class BookEnrichmentServiceTests(TestCase):
         result = BookEnrichmentService.get_book_info(self.isbn)
         self.assertIsNone(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_book_info_request_error(self, mock_get):
         mock_get.side_effect = requests.RequestException()
         result = BookEnrichmentService.get_book_info(self.isbn)
         self.assertIsNone(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_book_info_invalid_response(self, mock_get):
         mock_response = Mock()
         mock_response.json.side_effect = ValueError()
@@ -238,6 +342,64 @@ class BookEnrichmentServiceTests(TestCase):
         result = BookEnrichmentService.get_book_info(self.isbn)
         self.assertIsNone(result)
 
+    @patch("requests.Session.get")
+    def test_unknown_isbn_is_negatively_cached(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = {"totalItems": 0}
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        self.assertIsNone(BookEnrichmentService.get_book_info(self.isbn))
+        self.assertIsNone(BookEnrichmentService.get_book_info(self.isbn))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(cache.get(f"book:{self.isbn}"), {"__negative__": "not_found"})
+
+    @override_settings(NEGATIVE_CACHE_TTL=3600, TRANSIENT_FAILURE_TTL=30)
+    @patch("books.services.cache.cache.set")
+    @patch("requests.Session.get")
+    def test_transient_failures_get_shorter_backoff(self, mock_get, mock_set):
+        mock_response = Mock(status_code=503)
+        mock_response.raise_for_status.side_effect = requests.HTTPError(
+            response=mock_response
+        )
+        mock_get.return_value = mock_response
+
+        self.assertIsNone(BookEnrichmentService.get_book_info(self.isbn))
+        mock_set.assert_called_once_with(
+            f"book:{self.isbn}", {"__negative__": "unavailable"}, timeout=30
+        )
+
+    @override_settings(GOOGLE_BOOKS_MAX_RETRIES=0)
+    @patch("requests.Session.get")
+    def test_only_not_found_client_errors_are_final(self, mock_get):
+        mock_response = Mock(status_code=404)
+        mock_response.raise_for_status.side_effect = requests.HTTPError(
+            response=mock_response
+        )
+        mock_get.return_value = mock_response
+
+        undecorated = BookEnrichmentService.get_book_info.__wrapped__
+        self.assertIsNone(undecorated(self.isbn))
+
+        for status_code in (400, 403, 408, 429):
+            mock_response.status_code = status_code
+            with self.assertRaises(TransientEnrichmentError, msg=status_code):
+                undecorated(self.isbn)
+
+    @override_settings(GOOGLE_BOOKS_MAX_RETRIES=0)
+    @patch("requests.Session.get")
+    def test_quota_errors_are_not_negatively_cached(self, mock_get):
+        mock_response = Mock(status_code=403)
+        mock_response.raise_for_status.side_effect = requests.HTTPError(
+            response=mock_response
+        )
+        mock_get.return_value = mock_response
+
+        self.assertIsNone(BookEnrichmentService.get_book_info(self.isbn))
+        self.assertEqual(
+            cache.get(f"book:{self.isbn}"), {"__negative__": "unavailable"}
+        )
+
     @patch("books.services.cache.get_redis_connection", Mock())
     def test_cache_decorator(self):
         """Test that the cache decorator properly caches and retrieves data"""
@@ -263,3 +425,1894 @@ class BookEnrichmentServiceTests(TestCase):
 
         # Verify the data matches
         self.assertEqual(result1, result2)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    },
+    ENRICHMENT_JOB_MAX_ATTEMPTS=2,
+)
+class EnrichmentJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            description="An unexpected journey",
+            published_date=date(1937, 9, 21),
+        )
+
+    def test_enqueue_is_deduplicated(self):
+        first = enqueue_enrichment(self.book)
+        second = enqueue_enrichment(self.book)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(EnrichmentJob.objects.count(), 1)
+
+    def test_claim_marks_jobs_running(self):
+        job = enqueue_enrichment(self.book)
+        claimed = claim_enrichment_jobs(10)
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(claimed[0].status, EnrichmentJob.Status.RUNNING)
+        self.assertEqual(claimed[0].attempts, 1)
+        # Running jobs are not handed out twice
+        self.assertEqual(claim_enrichment_jobs(10), [])
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_process_job_success(self, mock_get_book_info):
+        mock_get_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
+            "volumeInfo"
+        ]
+        enqueue_enrichment(self.book)
+        (job,) = claim_enrichment_jobs(10)
+
+        self.assertTrue(process_enrichment_job(job))
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.enrichment_status, Book.EnrichmentStatus.ENRICHED)
+        self.assertEqual(self.book.enriched_data["title"], "The Hobbit")
+        self.assertFalse(EnrichmentJob.objects.exists())
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_process_job_retries_then_fails(self, mock_get_book_info):
+        mock_get_book_info.return_value = None
+        enqueue_enrichment(self.book)
+
+        (job,) = claim_enrichment_jobs(10)
+        self.assertFalse(process_enrichment_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, EnrichmentJob.Status.QUEUED)
+        self.assertGreater(job.run_after, job.created_at)
+
+        EnrichmentJob.objects.update(run_after=job.created_at)
+        (job,) = claim_enrichment_jobs(10)
+        self.assertFalse(process_enrichment_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, EnrichmentJob.Status.FAILED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.enrichment_status, Book.EnrichmentStatus.FAILED)
+
+    @override_settings(GOOGLE_BOOKS_MAX_RETRIES=0)
+    @patch("requests.Session.get")
+    def test_retries_bypass_negative_cache_entries(self, mock_get):
+        quota_error = Mock(status_code=403)
+        quota_error.raise_for_status.side_effect = requests.HTTPError(
+            response=quota_error
+        )
+        not_found = Mock()
+        not_found.json.return_value = {"totalItems": 0}
+        found = Mock()
+        found.json.return_value = MOCK_BOOK_API_RESPONSE
+        mock_get.side_effect = [quota_error, not_found, found]
+        enqueue_enrichment(self.book)
+
+        with override_settings(ENRICHMENT_JOB_MAX_ATTEMPTS=3):
+            for expected in (False, False, True):
+                EnrichmentJob.objects.update(run_after=timezone.now())
+                (job,) = claim_enrichment_jobs(10)
+                self.assertEqual(process_enrichment_job(job), expected)
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.enrichment_status, Book.EnrichmentStatus.ENRICHED)
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_worker_command_drains_queue(self, mock_get_book_info):
+        mock_get_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
+            "volumeInfo"
+        ]
+        enqueue_enrichment(self.book)
+        out = StringIO()
+        call_command("process_enrichment_jobs", "--once", stdout=out)
+
+        self.assertIn("Processed 1 job(s): 1 enriched", out.getvalue())
+        self.assertFalse(EnrichmentJob.objects.exists())
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
+)
+class EnrichBooksCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        self.missing = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.enriched = Book.objects.create(
+            title="The Silmarillion",
+            author="J.R.R. Tolkien",
+            isbn="9780261102422",
+            published_date=date(1977, 9, 15),
+        )
+        self.enriched.update_enriched_data({"title": "Old", "authors": ["Old"]})
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_enriches_only_missing_books(self, mock_get_book_info):
+        mock_get_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
+            "volumeInfo"
+        ]
+        out = StringIO()
+        call_command("enrich_books", "--workers", "2", stdout=out)
+
+        mock_get_book_info.assert_called_once_with(self.missing.isbn)
+        self.missing.refresh_from_db()
+        self.assertEqual(self.missing.enrichment_status, Book.EnrichmentStatus.ENRICHED)
+        self.assertIsNotNone(self.missing.enriched_at)
+        self.assertIn("Enriched 1/1 book(s)", out.getvalue())
+        self.assertIn("ISBNs/s", out.getvalue())
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_refreshes_stale_books_and_counts_failures(self, mock_get_book_info):
+        mock_get_book_info.return_value = None
+        out = StringIO()
+        call_command("enrich_books", "--stale-days", "0", stdout=out)
+
+        self.assertEqual(mock_get_book_info.call_count, 2)
+        self.assertIn("Enriched 0/2 book(s)", out.getvalue())
+        self.assertIn("2 failure(s)", out.getvalue())
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
+)
+class CacheMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        REGISTRY.reset()
+        self.isbn = "9780261102217"
+
+    @patch("books.services.cache.get_redis_connection")
+    def test_cache_records_hits_and_misses_without_key_scans(self, mock_redis):
+        test_data = MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]
+
+        @cache_book_info
+        def lookup(isbn):
+            return test_data
+
+        lookup(self.isbn)
+        lookup(self.isbn)
+        book_info_local_cache.clear()
+        cache.set(f"book:{self.isbn}", {"title": ""})
+        lookup(self.isbn)
+
+        self.assertEqual(CACHE_REQUESTS.value(operation="lookup", result="miss"), 1)
+        self.assertEqual(CACHE_REQUESTS.value(operation="lookup", result="hit"), 1)
+        self.assertEqual(CACHE_REQUESTS.value(operation="lookup", result="invalid"), 1)
+        self.assertEqual(CACHE_LOOKUP_SECONDS.count(operation="lookup"), 3)
+        mock_redis.return_value.keys.assert_not_called()
+
+    @patch("books.services.cache.cache.get", side_effect=ConnectionError("down"))
+    def test_cache_errors_fall_back_to_function(self, mock_get):
+        @cache_book_info
+        def lookup(isbn):
+            return None
+
+        self.assertIsNone(lookup(self.isbn))
+        self.assertEqual(CACHE_REQUESTS.value(operation="lookup", result="error"), 1)
+
+    def test_metrics_endpoint_exports_prometheus_text(self):
+        CACHE_REQUESTS.inc(operation="get_book_info", result="hit")
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn("# TYPE books_cache_requests_total counter", body)
+        self.assertIn(
+            'books_cache_requests_total{operation="get_book_info",result="hit"} 1.0',
+            body,
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
+)
+class TwoTierCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        REGISTRY.reset()
+        self.isbn = "9780261102217"
+        self.data = MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]
+
+    def test_local_cache_evicts_least_recently_used(self):
+        local = LocalCache("test_lru", max_entries=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("a"), 1)
+        self.assertEqual(
+            LOCAL_CACHE_EVICTIONS.value(cache="test_lru", reason="capacity"), 1
+        )
+
+    @patch("books.services.local_cache.time.monotonic")
+    def test_local_cache_expires_entries(self, mock_monotonic):
+        local = LocalCache("test_ttl", max_entries=10, ttl=60)
+        mock_monotonic.return_value = 100.0
+        local.set("a", 1, ttl=5)
+        mock_monotonic.return_value = 106.0
+
+        self.assertIsNone(local.get("a"))
+        self.assertEqual(
+            LOCAL_CACHE_EVICTIONS.value(cache="test_ttl", reason="expired"), 1
+        )
+
+    def test_local_tier_serves_repeated_lookups(self):
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            return self.data
+
+        lookup(self.isbn)
+        cache.clear()  # Shared tier is no longer consulted once cached locally
+        result = lookup(self.isbn)
+
+        self.assertEqual(result, self.data)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(CACHE_TIER_REQUESTS.value(tier="local", result="hit"), 1)
+        self.assertEqual(CACHE_TIER_REQUESTS.value(tier="shared", result="miss"), 1)
+
+    def test_invalidate_drops_every_tier(self):
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            return self.data
+
+        lookup(self.isbn)
+        invalidate_book_info(self.isbn)
+        lookup(self.isbn)
+
+        self.assertEqual(len(calls), 2)
+
+    def test_invalidation_message_evicts_local_entry(self):
+        book_info_local_cache.set(f"book:{self.isbn}", self.data)
+        InvalidationListener._handle(
+            {"data": f'{{"cache": "book_info", "key": "book:{self.isbn}"}}'}
+        )
+        self.assertIsNone(book_info_local_cache.get(f"book:{self.isbn}"))
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    },
+    CACHE_LOCK_POLL_INTERVAL=0.01,
+)
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        REGISTRY.reset()
+        self.isbn = "9780261102217"
+        self.data = MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]
+
+    def test_concurrent_misses_share_one_fetch(self):
+        release = threading.Event()
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            release.wait(5)
+            return self.data
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(lookup(self.isbn)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let every thread reach the coalescer before the fetch completes
+        while not calls:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [self.data] * 5)
+        self.assertEqual(CACHE_COALESCED_REQUESTS.value(operation="lookup"), 4)
+
+    def test_waits_for_worker_holding_the_lock(self):
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            return self.data
+
+        cache_key = f"book:{self.isbn}"
+        cache.set(f"lock:{cache_key}", "other-worker")
+        threading.Timer(0.05, lambda: cache.set(cache_key, self.data)).start()
+
+        self.assertEqual(lookup(self.isbn), self.data)
+        self.assertEqual(calls, [])
+        self.assertEqual(CACHE_LOCK_WAIT_SECONDS.count(outcome="served"), 1)
+
+    @override_settings(CACHE_LOCK_WAIT_TIMEOUT=0.05)
+    def test_fetches_itself_when_lock_wait_times_out(self):
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            return self.data
+
+        cache.set(f"lock:book:{self.isbn}", "stuck-worker")
+
+        self.assertEqual(lookup(self.isbn), self.data)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(CACHE_LOCK_WAIT_SECONDS.count(outcome="timeout"), 1)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    },
+    CACHE_STALE_WHILE_REVALIDATE=True,
+    CACHE_SOFT_TTL=3600,
+)
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        REGISTRY.reset()
+        self.isbn = "9780261102217"
+        self.cache_key = f"book:{self.isbn}"
+        self.old_data = {"title": "Old title", "authors": ["J.R.R. Tolkien"]}
+        self.new_data = MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"]
+
+    def _wait_for_revalidation(self, outcome):
+        deadline = time.monotonic() + 5
+        while CACHE_REVALIDATIONS.value(operation="lookup", outcome=outcome) < 1:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def _cache_stale_entry(self):
+        cache.set(
+            self.cache_key,
+            {"__stale_after__": time.time() - 1, "__value__": self.old_data},
+        )
+
+    def test_fresh_entries_are_served_without_refresh(self):
+        calls = []
+
+        @cache_book_info
+        def lookup(isbn):
+            calls.append(isbn)
+            return self.new_data
+
+        lookup(self.isbn)
+        book_info_local_cache.clear()
+        self.assertEqual(lookup(self.isbn), self.new_data)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(CACHE_REQUESTS.value(operation="lookup", result="hit"), 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        @cache_book_info
+        def lookup(isbn):
+            return self.new_data
+
+        self._cache_stale_entry()
+
+        self.assertEqual(lookup(self.isbn), self.old_data)
+        self._wait_for_revalidation("refreshed")
+        book_info_local_cache.clear()
+        self.assertEqual(lookup(self.isbn), self.new_data)
+        self.assertEqual(
+            CACHE_REQUESTS.value(operation="lookup", result="stale_hit"), 1
+        )
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        @cache_book_info
+        def lookup(isbn):
+            raise TransientEnrichmentError("timeout")
+
+        self._cache_stale_entry()
+
+        self.assertEqual(lookup(self.isbn), self.old_data)
+        self._wait_for_revalidation("failed")
+        book_info_local_cache.clear()
+        self.assertEqual(lookup(self.isbn), self.old_data)
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        for index in range(25):
+            Book.objects.create(
+                title=f"Book {index}",
+                author="Author",
+                isbn=f"{9780000000000 + index}",
+                published_date=date(2000, 1, 1),
+            )
+        self.url = reverse("book-list")
+
+    def test_cursor_pages_walk_the_whole_table_without_count(self):
+        seen = []
+        url = f"{self.url}?pagination=cursor"
+        while url:
+            # One query per page: no COUNT(*) is issued
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(book["id"] for book in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(
+            Book.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get(f"{self.url}?pagination=cursor")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(first.data["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_still_the_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 10)
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            description="An unexpected journey",
+            published_date=date(1937, 9, 21),
+            enriched_data=MOCK_BOOK_API_RESPONSE["items"][0]["volumeInfo"],
+        )
+        self.url = reverse("book-list")
+
+    def _book_queries(self, context):
+        return [q["sql"] for q in context.captured_queries if "books_book" in q["sql"]]
+
+    def test_list_defaults_to_summary_without_loading_enriched_data(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(
+            set(response.data["results"][0]), set(BookSerializer.SUMMARY_FIELDS)
+        )
+        for sql in self._book_queries(context):
+            self.assertNotIn('"enriched_data"', sql)
+            self.assertNotIn('"description"', sql)
+
+    def test_full_view_and_exclude(self):
+        response = self.client.get(f"{self.url}?view=full&exclude=description")
+        book = response.data["results"][0]
+        self.assertIn("enriched_data", book)
+        self.assertNotIn("description", book)
+
+    def test_fields_projection_on_retrieve(self):
+        url = reverse("book-detail", args=[self.book.id])
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{url}?fields=title,isbn")
+
+        self.assertEqual(
+            response.data, {"title": "The Hobbit", "isbn": "9780261102217"}
+        )
+        self.assertNotIn('"enriched_data"', self._book_queries(context)[0])
+
+    def test_retrieve_defaults_to_full_representation(self):
+        url = reverse("book-detail", args=[self.book.id])
+        response = self.client.get(url)
+        self.assertEqual(set(response.data), set(BookSerializer.Meta.fields))
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(f"{self.url}?fields=title,price")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price", str(response.data["fields"]))
+
+
+class BookSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hobbit = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            description="A journey to the Lonely Mountain",
+            published_date=date(1937, 9, 21),
+        )
+        self.mountain = Book.objects.create(
+            title="Into Thin Air",
+            author="Jon Krakauer",
+            isbn="9780385494786",
+            description="A climber's account of the Everest disaster",
+            published_date=date(1997, 4, 1),
+        )
+        self.url = reverse("book-search")
+
+    def test_search_matches_stemmed_words(self):
+        response = self.client.get(self.url, {"q": "journeys"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([b["id"] for b in response.data["results"]], [self.hobbit.id])
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.mountain.description = "Not a hobbit story"
+        self.mountain.save()
+
+        response = self.client.get(self.url, {"q": "hobbit"})
+        self.assertEqual(
+            [b["id"] for b in response.data["results"]],
+            [self.hobbit.id, self.mountain.id],
+        )
+
+    def test_enriched_fields_are_searchable(self):
+        self.mountain.update_enriched_data(
+            {
+                "title": "Into Thin Air",
+                "authors": ["Jon Krakauer"],
+                "subtitle": "A Personal Account of the Mt. Everest Disaster",
+                "categories": ["Mountaineering"],
+                "publisher": "Anchor",
+            }
+        )
+
+        response = self.client.get(self.url, {"q": "mountaineering anchor"})
+        self.assertEqual(
+            [b["id"] for b in response.data["results"]], [self.mountain.id]
+        )
+
+    def test_book_and_search_vector_are_saved_atomically(self):
+        self.hobbit.title = "The Hobbit, or There and Back Again"
+        with (
+            patch.object(
+                BookQuerySet, "update_search_vector", side_effect=DatabaseError
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            self.hobbit.save()
+
+        self.hobbit.refresh_from_db()
+        self.assertEqual(self.hobbit.title, "The Hobbit")
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AutocompleteTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hobbit = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        Book.objects.create(
+            title="Into Thin Air",
+            author="Jon Krakauer",
+            isbn="9780385494786",
+            published_date=date(1997, 4, 1),
+        )
+        self.url = reverse("book-autocomplete")
+
+    def test_matches_prefixes_and_typos(self):
+        for query in ("hob", "hobit", "tolk"):
+            response = self.client.get(self.url, {"q": query})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [b["id"] for b in response.data["results"]],
+                [self.hobbit.id],
+                query,
+            )
+
+    def test_repeated_prefix_is_served_from_cache(self):
+        self.client.get(self.url, {"q": "Hobbit"})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"q": "  hobbit "})
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.data["results"][0]["id"], self.hobbit.id)
+
+    def test_new_books_invalidate_cached_suggestions(self):
+        self.client.get(self.url, {"q": "hobbit"})
+        version = services.get_collection_version()
+
+        Book.objects.create(
+            title="The Hobbit Companion",
+            author="David Day",
+            isbn="9780760703779",
+            published_date=date(1997, 1, 1),
+        )
+
+        self.assertNotEqual(services.get_collection_version(), version)
+        response = self.client.get(self.url, {"q": "hobbit"})
+        self.assertEqual(len(response.data["results"]), 2)
+
+    @patch("books.services.cache.cache.get_or_set", side_effect=ConnectionError("down"))
+    def test_cache_errors_fall_back_to_database(self, mock_get_or_set):
+        response = self.client.get(self.url, {"q": "hobbit"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.hobbit.id)
+
+    def test_limit_is_capped(self):
+        response = self.client.get(self.url, {"q": "the", "limit": 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(len(response.data["results"]), 25)
+
+    def test_autocomplete_requires_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EnrichedDataFilterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hobbit = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.hobbit.update_enriched_data(
+            {
+                "categories": ["Fiction", "Fantasy"],
+                "language": "en",
+                "publisher": "HarperCollins",
+                "average_rating": 4.5,
+                "page_count": 310,
+            }
+        )
+        self.climb = Book.objects.create(
+            title="Into Thin Air",
+            author="Jon Krakauer",
+            isbn="9780385494786",
+            published_date=date(1997, 4, 1),
+        )
+        self.climb.update_enriched_data(
+            {
+                "categories": ["Sports & Recreation"],
+                "language": "en",
+                "publisher": "Anchor",
+                "average_rating": 3.5,
+                "page_count": 368,
+            }
+        )
+        Book.objects.create(
+            title="Dom Casmurro",
+            author="Machado de Assis",
+            isbn="9788535910681",
+            published_date=date(1899, 1, 1),
+        )
+        self.url = reverse("book-list")
+
+    def get_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {book["id"] for book in response.data["results"]}
+
+    def test_numeric_attributes_are_extracted(self):
+        self.hobbit.refresh_from_db()
+        self.assertEqual(self.hobbit.enriched_average_rating, 4.5)
+        self.assertEqual(self.hobbit.enriched_page_count, 310)
+
+    def test_filters(self):
+        both = {self.hobbit.id, self.climb.id}
+        self.assertEqual(self.get_ids(language="en"), both)
+        self.assertEqual(self.get_ids(categories="Fiction"), {self.hobbit.id})
+        self.assertEqual(self.get_ids(categories="Fiction,Fantasy"), {self.hobbit.id})
+        self.assertEqual(self.get_ids(categories="Fiction,Sports & Recreation"), set())
+        self.assertEqual(self.get_ids(publisher="Anchor"), {self.climb.id})
+        self.assertEqual(self.get_ids(rating_min=4), {self.hobbit.id})
+        self.assertEqual(self.get_ids(rating_max=4, language="en"), {self.climb.id})
+        self.assertEqual(self.get_ids(pages_min=300, pages_max=320), {self.hobbit.id})
+
+    def test_filters_apply_to_search(self):
+        response = self.client.get(
+            reverse("book-search"), {"q": "hobbit", "rating_max": 4}
+        )
+        self.assertEqual(response.data["results"], [])
+
+    def test_invalid_number_is_rejected(self):
+        response = self.client.get(self.url, {"rating_min": "high"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filters_use_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        # Without ordering, so the plan cannot walk the created_at index instead.
+        books = Book.objects.order_by()
+        plan = books.filter(
+            enriched_data__contains={"categories": ["Fiction"], "language": "en"}
+        ).explain()
+        self.assertIn("book_enriched_data_idx", plan)
+
+        plan = books.filter(enriched_average_rating__gte=4).explain()
+        self.assertIn("book_enriched_rating_idx", plan)
+
+        plan = books.filter(enriched_page_count__lte=320).explain()
+        self.assertIn("book_enriched_pages_idx", plan)
+
+
+class BulkUpsertTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.existing = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.url = reverse("book-bulk")
+
+    def book(self, isbn, title="A Book", **extra):
+        return {
+            "title": title,
+            "author": "Someone",
+            "isbn": isbn,
+            "published_date": "2020-01-01",
+            **extra,
+        }
+
+    def test_bulk_upsert_reports_each_item(self):
+        payload = [
+            self.book("9780000000001"),
+            {
+                "title": "The Hobbit",
+                "author": "J.R.R. Tolkien",
+                "isbn": "9780261102217",
+                "published_date": "1937-09-21",
+            },
+            self.book("9780000000002"),
+            self.book("123"),
+            self.book("9780000000001", title="Duplicate"),
+        ]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["created", "unchanged", "created", "invalid", "invalid"],
+        )
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["invalid"], 2)
+        self.assertIn("isbn", response.data["results"][3]["errors"])
+        self.assertEqual(response.data["results"][1]["id"], self.existing.id)
+        created = Book.objects.get(isbn="9780000000001")
+        self.assertEqual(response.data["results"][0]["id"], created.id)
+        self.assertEqual(created.title, "A Book")
+        self.assertIsNotNone(created.search_vector)
+
+        # Only new books are queued for enrichment.
+        self.assertEqual(
+            set(EnrichmentJob.objects.values_list("book__isbn", flat=True)),
+            {"9780000000001", "9780000000002"},
+        )
+
+    def test_bulk_upsert_updates_changed_books(self):
+        self.existing.update_enriched_data({"title": "The Hobbit"})
+        created_at = self.existing.created_at
+
+        response = self.client.post(
+            self.url,
+            [self.book("9780261102217", title="The Hobbit, or There and Back Again")],
+            format="json",
+        )
+
+        self.assertEqual(response.data["results"][0]["status"], "updated")
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.title, "The Hobbit, or There and Back Again")
+        self.assertEqual(self.existing.created_at, created_at)
+        self.assertEqual(self.existing.enrichment_status, Book.EnrichmentStatus.PENDING)
+        self.assertTrue(self.existing.enrichment_jobs.exists())
+
+    def test_bulk_upsert_uses_a_constant_number_of_queries(self):
+        payload = [self.book(f"97800000{i:05d}") for i in range(300)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.data["created"], 300)
+        self.assertLess(len(queries), 15)
+
+    @override_settings(BOOKS_BULK_MAX_ITEMS=2)
+    def test_bulk_upsert_rejects_bad_payloads(self):
+        response = self.client.post(self.url, self.book("9780000000001"), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        payload = [self.book(f"978000000000{i}") for i in range(3)]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchRetrievalTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.books = [
+            Book.objects.create(
+                title=f"Book {i}",
+                author="Someone",
+                isbn=f"978000000000{i}",
+                published_date=date(2020, 1, 1),
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("book-batch")
+
+    def test_batch_by_isbn_preserves_order_and_reports_missing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.url, {"isbn": "9780000000002,978-0000000000,9789999999999"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [b["id"] for b in response.data["results"]],
+            [self.books[2].id, self.books[0].id],
+        )
+        self.assertEqual(response.data["missing"], ["9789999999999"])
+        self.assertIn("enriched_data", response.data["results"][0])
+        self.assertEqual(len([q for q in queries if "books_book" in q["sql"]]), 1)
+
+    def test_batch_by_id_with_projection(self):
+        ids = f"{self.books[1].id},{self.books[0].id},0"
+        response = self.client.get(self.url, {"id": ids, "fields": "title"})
+
+        self.assertEqual(
+            response.data["results"], [{"title": "Book 1"}, {"title": "Book 0"}]
+        )
+        self.assertEqual(response.data["missing"], [0])
+
+    @override_settings(BOOKS_BATCH_MAX_KEYS=2)
+    def test_batch_rejects_bad_requests(self):
+        for params in (
+            {},
+            {"id": "1", "isbn": "9780000000000"},
+            {"id": "one"},
+            {"id": "1,2,3"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+        # Duplicates do not count, and the limit is checked as keys are read
+        response = self.client.get(self.url, {"id": "1,1,2,2"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.url, {"id": "1,2,3,one"})
+        self.assertIn("At most 2 keys", str(response.data["id"]))
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hobbit = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.hobbit.update_enriched_data(
+            {"title": "The Hobbit", "language": "en", "categories": ["Fiction"]}
+        )
+        Book.objects.create(
+            title='Dom Casmurro, "a novel"',
+            author="Machado de Assis",
+            isbn="9788535910681",
+            published_date=date(1899, 1, 1),
+        )
+        self.url = reverse("book-export")
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    @override_settings(BOOKS_EXPORT_CHUNK_SIZE=1)
+    def test_ndjson_export_matches_api_representation(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 2)
+        detail = self.client.get(reverse("book-detail", args=[self.hobbit.id]))
+        self.assertEqual(rows[1], json.loads(detail.content))
+
+    def test_csv_export_with_filters_and_projection(self):
+        response = self.client.get(
+            self.url, {"format": "csv", "fields": "isbn,title,enriched_data"}
+        )
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.reader(StringIO(self.read(response))))
+        self.assertEqual(rows[0], ["isbn", "title", "enriched_data"])
+        self.assertEqual(rows[1], ["9788535910681", 'Dom Casmurro, "a novel"', ""])
+        self.assertEqual(json.loads(rows[2][2])["language"], "en")
+
+        response = self.client.get(
+            self.url, {"format": "csv", "fields": "isbn", "language": "en"}
+        )
+        self.assertEqual(self.read(response).splitlines(), ["isbn", "9780261102217"])
+
+    @override_settings(BOOKS_EXPORT_CHUNK_SIZE=1)
+    async def test_export_streams_asynchronously_under_asgi(self):
+        token = await sync_to_async(RefreshToken.for_user)(self.user)
+        response = await self.async_client.get(
+            self.url, headers={"Authorization": f"Bearer {token.access_token}"}
+        )
+
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.decode().splitlines()), 2)
+
+    def test_json_export(self):
+        response = self.client.get(self.url, {"format": "json", "fields": "isbn"})
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        self.assertEqual(
+            json.loads(self.read(response)),
+            [{"isbn": "9788535910681"}, {"isbn": "9780261102217"}],
+        )
+
+        response = self.client.get(
+            self.url, {"language": "fr"}, HTTP_ACCEPT="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(self.read(response)), [])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.url, {"fields": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {"fields": "nope", "format": "json"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsInstance(json.loads(response.content), dict)
+
+
+class ImportBooksCommandTests(TestCase):
+    def setUp(self):
+        self.existing = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.existing.update_enriched_data({"title": "The Hobbit"})
+
+    def run_import(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+        call_command("import_books", f.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self):
+        content = (
+            "isbn,title,author,description,published_date\n"
+            "978-0-261-10221-7,The Hobbit,J.R.R. Tolkien,,1937-09-21\n"
+            "0-7475-3274-X,Old Title,J.K. Rowling,,1997-06-26\n"
+            '074753274x,"Harry Potter, Book 1",J.K. Rowling,Wizards,1997-06-26\n'
+            "123,Bad ISBN,Someone,,2000-01-01\n"
+            "9780141439518,Pride and Prejudice,Jane Austen,,not a date\n"
+            "9780141439518,Pride and Prejudice,Jane Austen,,18130128\n"
+            "9780141439518,Pride and Prejudice,Jane Austen,,1813-W05-1\n"
+        )
+        out, err = self.run_import(content, ".csv", "--batch-size", "3")
+
+        self.assertIn("7 row(s)", out)
+        self.assertIn("1 created, 0 updated", out)
+        self.assertIn("4 invalid", out)
+        self.assertIn("Line 5: invalid ISBN", err)
+        for line in (6, 7, 8):
+            self.assertIn(f"Line {line}: published_date", err)
+
+        book = Book.objects.get(isbn="074753274X")
+        self.assertEqual(book.title, "Harry Potter, Book 1")
+        self.assertEqual(book.description, "Wizards")
+        self.assertEqual(book.enrichment_status, Book.EnrichmentStatus.PENDING)
+        self.assertEqual(Book.objects.search("wizards").get(), book)
+        # Only the new book is queued without --enrich
+        self.assertEqual(
+            list(EnrichmentJob.objects.values_list("book_id", flat=True)), [book.id]
+        )
+
+    def test_import_ndjson_updates_and_enqueues(self):
+        content = "\n".join(
+            json.dumps(row)
+            for row in [
+                {
+                    "isbn": "9780261102217",
+                    "title": "The Hobbit, or There and Back Again",
+                    "author": "J.R.R. Tolkien",
+                    "published_date": "1937-09-21",
+                },
+                {
+                    "isbn": "9780141439518",
+                    "title": "Pride and Prejudice",
+                    "author": "Jane Austen",
+                    "published_date": "1813-01-28",
+                },
+            ]
+        )
+        out, _ = self.run_import(content, ".ndjson", "--enrich")
+
+        self.assertIn("1 created, 1 updated", out)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.title, "The Hobbit, or There and Back Again")
+        self.assertEqual(self.existing.enrichment_status, Book.EnrichmentStatus.PENDING)
+        self.assertEqual(EnrichmentJob.objects.count(), 2)
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.detail_url = reverse("book-detail", args=[self.book.id])
+        self.list_url = reverse("book-list")
+
+    def test_retrieve_not_modified_loads_only_updated_at(self):
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"updated_at"', queries[0]["sql"])
+        self.assertNotIn('"title"', queries[0]["sql"])
+
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_etag_changes_with_book_and_representation(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.assertNotEqual(
+            self.client.get(self.detail_url, {"fields": "title"})["ETag"], etag
+        )
+
+        self.book.title = "The Hobbit, or There and Back Again"
+        self.book.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_follows_collection_version(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertNotEqual(self.client.get(self.list_url, {"page": 1})["ETag"], etag)
+
+        self.book.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_missing_book_is_still_404(self):
+        response = self.client.get(reverse("book-detail", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        REGISTRY.reset()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.list_url = reverse("book-list")
+        self.detail_url = reverse("book-detail", args=[self.book.id])
+
+    def test_list_hit_skips_the_database(self):
+        first = self.client.get(self.list_url, {"view": "full"})
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.list_url, {"view": "full"})
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(
+            RESPONSE_CACHE_REQUESTS.value(endpoint="list", result="hit"), 1
+        )
+        self.assertEqual(
+            RESPONSE_CACHE_REQUESTS.value(endpoint="list", result="miss"), 1
+        )
+
+    def test_writes_invalidate_cached_responses(self):
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        response = self.client.put(
+            self.detail_url,
+            {
+                "title": "The Hobbit, or There and Back Again",
+                "author": "J.R.R. Tolkien",
+                "isbn": "9780261102217",
+                "published_date": "1937-09-21",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        title = "The Hobbit, or There and Back Again"
+        self.assertEqual(self.client.get(self.detail_url).data["title"], title)
+        self.assertEqual(
+            self.client.get(self.list_url).data["results"][0]["title"], title
+        )
+        self.assertEqual(
+            RESPONSE_CACHE_REQUESTS.value(endpoint="retrieve", result="hit"), 0
+        )
+
+    def test_params_are_normalized(self):
+        self.client.get(self.list_url, {"view": "full", "page": 1})
+        self.client.get(f"{self.list_url}?page=1&view=full")
+        self.assertEqual(
+            RESPONSE_CACHE_REQUESTS.value(endpoint="list", result="hit"), 1
+        )
+
+    @override_settings(RESPONSE_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.assertEqual(
+            RESPONSE_CACHE_REQUESTS.value(endpoint="list", result="hit"), 0
+        )
+
+
+class FastReadPathTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="Le Petit Prince",
+            author="Antoine de Saint-Exupéry",
+            isbn="9780156012195",
+            description="Line separator and   paragraph",
+            published_date=date(1943, 4, 6),
+        )
+        self.book.update_enriched_data(
+            {
+                "title": "Le Petit Prince",
+                "categories": ["Fiction"],
+                "average_rating": 4.5,
+                "page_count": 96,
+                "image_links": {"thumbnail": "http://example.com/a.jpg"},
+            }
+        )
+        Book.objects.create(
+            title="Pride and Prejudice",
+            author="Jane Austen",
+            isbn="9780141439518",
+            published_date=date(1813, 1, 28),
+        )
+
+    def drf_render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_retrieve_is_byte_identical_to_drf(self):
+        response = self.client.get(reverse("book-detail", args=[self.book.id]))
+        expected = self.drf_render(
+            BookSerializer(Book.objects.get(pk=self.book.pk)).data
+        )
+        self.assertEqual(response.content, expected)
+        self.assertIn(b"\\u2028", response.content)
+
+    def test_list_is_byte_identical_to_drf(self):
+        books = Book.objects.all()
+        for params, fields in (
+            ({}, BookSerializer.SUMMARY_FIELDS),
+            ({"view": "full"}, None),
+            ({"fields": "isbn,created_at"}, ["isbn", "created_at"]),
+        ):
+            response = self.client.get(reverse("book-list"), params)
+            expected = self.drf_render(
+                BookSerializer(books, many=True, fields=fields).data
+            )
+            self.assertEqual(response.content.split(b'"results":')[1], expected + b"}")
+
+    @patch("books.api.pagination.BookPagination.page_size", 1)
+    def test_cursor_pagination_with_rows(self):
+        response = self.client.get(reverse("book-list"), {"pagination": "cursor"})
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["isbn"], "9780156012195")
+
+    def test_pretty_printing_falls_back_to_drf(self):
+        response = self.client.get(
+            reverse("book-detail", args=[self.book.id]),
+            HTTP_ACCEPT="application/json; indent=2",
+        )
+        self.assertIn(b'\n  "id"', response.content)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
+)
+class AsyncEnrichmentClientTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        book_info_local_cache.clear()
+        self.isbn = "9780261102217"
+        self.requests = 0
+        url = patch.object(
+            BookEnrichmentService,
+            "GOOGLE_BOOKS_API_URL",
+            "https://books.example.com/volumes",
+        )
+        url.start()
+        self.addCleanup(url.stop)
+
+    def mock_client(self, status_code=200, body=MOCK_BOOK_API_RESPONSE):
+        async def handler(request):
+            self.requests += 1
+            # Let concurrent callers pile up on the in-flight fetch
+            await asyncio.sleep(0.01)
+            return httpx.Response(status_code, json=body)
+
+        return patch(
+            "books.services.enrichment.get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+    async def test_concurrent_lookups_share_one_request(self):
+        with self.mock_client():
+            results = await asyncio.gather(
+                *(BookEnrichmentService.aget_book_info(self.isbn) for _ in range(5))
+            )
+            cached = await BookEnrichmentService.aget_book_info(self.isbn)
+
+        self.assertEqual(self.requests, 1)
+        self.assertEqual(results[0]["title"], "The Hobbit")
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(cached, results[0])
+
+    @override_settings(GOOGLE_BOOKS_MAX_RETRIES=2, GOOGLE_BOOKS_RETRY_BASE_DELAY=0)
+    async def test_server_errors_are_retried_then_negatively_cached(self):
+        with self.mock_client(status_code=503, body={}):
+            self.assertIsNone(await BookEnrichmentService.aget_book_info(self.isbn))
+            self.assertIsNone(await BookEnrichmentService.aget_book_info(self.isbn))
+
+        self.assertEqual(self.requests, 3)
+        self.assertEqual(
+            cache.get(f"book:{self.isbn}"), {"__negative__": "unavailable"}
+        )
+
+    @patch(
+        "books.services.enrichment.BookEnrichmentService.aget_book_info",
+        new_callable=AsyncMock,
+    )
+    def test_enrich_books_async_mode(self, mock_aget_book_info):
+        mock_aget_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
+            "volumeInfo"
+        ]
+        book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn=self.isbn,
+            published_date=date(1937, 9, 21),
+        )
+        out = StringIO()
+        call_command("enrich_books", "--async", "--workers", "2", stdout=out)
+
+        mock_aget_book_info.assert_awaited_once_with(self.isbn)
+        book.refresh_from_db()
+        self.assertEqual(book.enrichment_status, Book.EnrichmentStatus.ENRICHED)
+        self.assertIn("Enriched 1/1 book(s)", out.getvalue())
+
+
+class AsyncBookViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        Book.objects.create(
+            title="Pride and Prejudice",
+            author="Jane Austen",
+            isbn="9780141439518",
+            published_date=date(1813, 1, 28),
+        )
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(reverse("async-book-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_list_matches_sync_endpoint(self):
+        for params in ({}, {"view": "full"}, {"pagination": "cursor"}):
+            expected = await sync_to_async(self.client.get)(
+                reverse("book-list"), params, headers=self.headers
+            )
+            response = await self.async_client.get(
+                reverse("async-book-list"), params, headers=self.headers
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+
+    async def test_retrieve(self):
+        url = reverse("async-book-detail", args=[self.book.id])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["isbn"], self.book.isbn)
+
+        url = reverse("async-book-detail", args=[self.book.id + 100])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch.object(BookViewSet, "permission_classes", [DenyObjectAccess])
+    async def test_retrieve_checks_object_permissions(self):
+        url = reverse("async-book-detail", args=[self.book.id])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_invalid_page(self):
+        response = await self.async_client.get(
+            reverse("async-book-list"), {"page": 9}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn("detail", response.json())
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    },
+    RESPONSE_CACHE_TTL=0,
+)
+class CachedAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_local_cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("book-list")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = User._meta.db_table
+        return len([q for q in queries if f'FROM "{table}"' in q["sql"]]), len(queries)
+
+    def test_user_is_loaded_once(self):
+        first_user_queries, first_total = self.user_queries()
+        self.assertEqual(first_user_queries, 1)
+
+        # Served from Redis, then from the in-process tier
+        user_local_cache.clear()
+        self.assertEqual(self.user_queries(), (0, first_total - 1))
+        self.assertEqual(self.user_queries(), (0, first_total - 1))
+
+    def test_deactivated_user_is_rejected(self):
+        self.user_queries()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_hash_is_not_cached(self):
+        cache.clear()
+        with patch("books.services.users.cache.add", wraps=cache.add) as mock_add:
+            self.user_queries()
+        # Versions expire, after the entries stamped with them
+        mock_add.assert_any_call(
+            f"users:{self.user.pk}:version", ANY, timeout=settings.USER_CACHE_TTL * 2
+        )
+        entry = cache.get(f"users:{self.user.pk}")
+        self.assertNotIn("password", entry["fields"])
+        self.assertNotIn(self.user.password, str(entry))
+
+        user = services.get_cached_user(self.user.pk)
+        self.assertEqual(user.get_deferred_fields(), {"password"})
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_revoke_hash(user), get_md5_hash_password(self.user.password)
+            )
+
+    def test_queryset_updates_need_explicit_invalidation(self):
+        self.user_queries()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        services.invalidate_cached_user(self.user.pk)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_entries_of_an_older_version_are_ignored(self):
+        self.user_queries()
+        # An invalidation racing with the fill that stored the entry
+        cache.set(f"users:{self.user.pk}:version", "newer", timeout=None)
+        user_local_cache.clear()
+
+        self.assertEqual(self.user_queries()[0], 1)
+
+    @patch("books.services.users.cache.get_many", side_effect=ConnectionError("down"))
+    def test_cache_errors_fall_back_to_the_database(self, mock_get_many):
+        self.assertEqual(self.user_queries()[0], 1)
+        self.assertEqual(self.user_queries()[0], 1)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    },
+    GOOGLE_BOOKS_MAX_RETRIES=2,
+    GOOGLE_BOOKS_RETRY_BASE_DELAY=0,
+    GOOGLE_BOOKS_BREAKER_FAILURES=2,
+)
+class ResilientClientTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        REGISTRY.reset()
+        self.isbn = "9780261102217"
+        # Call the client directly, without the ISBN cache in front
+        self.get_book_info = BookEnrichmentService.get_book_info.__wrapped__
+
+    def ok_response(self):
+        response = Mock()
+        response.json.return_value = MOCK_BOOK_API_RESPONSE
+        response.raise_for_status.return_value = None
+        return response
+
+    @patch("requests.Session.get")
+    def test_requests_have_timeouts(self, mock_get):
+        mock_get.return_value = self.ok_response()
+        self.get_book_info(self.isbn)
+        self.assertEqual(
+            mock_get.call_args.kwargs["timeout"],
+            (settings.GOOGLE_BOOKS_CONNECT_TIMEOUT, settings.GOOGLE_BOOKS_READ_TIMEOUT),
+        )
+
+    @patch("requests.Session.get")
+    def test_transient_failures_are_retried(self, mock_get):
+        mock_get.side_effect = [requests.ConnectionError(), self.ok_response()]
+        self.assertEqual(self.get_book_info(self.isbn)["title"], "The Hobbit")
+        self.assertEqual(UPSTREAM_RETRIES.value(name="google_books"), 1)
+
+        mock_get.reset_mock(side_effect=True)
+        mock_get.side_effect = requests.Timeout()
+        with self.assertRaises(TransientEnrichmentError):
+            self.get_book_info(self.isbn)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("requests.Session.get", side_effect=requests.Timeout())
+    def test_breaker_opens_and_fails_fast(self, mock_get):
+        for _ in range(2):
+            with self.assertRaises(TransientEnrichmentError):
+                self.get_book_info(self.isbn)
+        self.assertEqual(CIRCUIT_BREAKER_STATE.value(name="google_books"), 2)
+
+        mock_get.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            self.get_book_info(self.isbn)
+        mock_get.assert_not_called()
+        self.assertEqual(CIRCUIT_BREAKER_REJECTIONS.value(name="google_books"), 1)
+
+    @patch("requests.Session.get", side_effect=requests.Timeout())
+    def test_half_open_probe(self, mock_get):
+        for _ in range(2):
+            with self.assertRaises(TransientEnrichmentError):
+                self.get_book_info(self.isbn)
+
+        now = time.time()
+        clock = "books.services.resilience.time.time"
+
+        # Recovery timeout elapsed: a failed probe opens the circuit again
+        with patch(clock, return_value=now + 60):
+            with self.assertRaises(TransientEnrichmentError):
+                self.get_book_info(self.isbn)
+            with self.assertRaises(CircuitOpenError):
+                self.get_book_info(self.isbn)
+
+        # Only one caller (here another worker) probes, and its success closes it
+        mock_get.side_effect = None
+        mock_get.return_value = self.ok_response()
+        with patch(clock, return_value=now + 120):
+            self.assertTrue(get_google_books_breaker().allow())
+            with self.assertRaises(CircuitOpenError):
+                self.get_book_info(self.isbn)
+            get_google_books_breaker().record_success()
+            self.assertIsNotNone(self.get_book_info(self.isbn))
+        self.assertEqual(CIRCUIT_BREAKER_STATE.value(name="google_books"), 0)
+
+    @patch("requests.Session.get", side_effect=requests.Timeout())
+    async def test_async_client_shares_the_breaker(self, mock_get):
+        for _ in range(2):
+            with self.assertRaises(TransientEnrichmentError):
+                await sync_to_async(self.get_book_info)(self.isbn)
+
+        # Fails fast without touching the network
+        with patch(
+            "books.services.enrichment.get_async_http_client",
+            side_effect=AssertionError,
+        ):
+            with self.assertRaises(CircuitOpenError):
+                await BookEnrichmentService.aget_book_info.__wrapped__(self.isbn)
+
+
+class RateLimiterTests(APITestCase):
+    """Runs against the Redis cache configured in the settings."""
+
+    def setUp(self):
+        REGISTRY.reset()
+        self.redis = get_redis_connection("default")
+        self.redis.delete("ratelimit:test")
+        self.addCleanup(self.redis.delete, "ratelimit:test")
+
+    def limiter(self, **kwargs):
+        options = {"rate": 20, "burst": 2, "reserved": 0, "max_wait": 5}
+        options.update(kwargs)
+        return TokenBucketLimiter("test", **options)
+
+    def test_burst_then_rate(self):
+        limiter = self.limiter()
+        self.assertLess(limiter.acquire(), 0.02)
+        self.assertLess(limiter.acquire(), 0.02)
+        # The bucket is empty: the next token comes 1/20s later
+        self.assertGreater(limiter.acquire(), 0.04)
+        self.assertEqual(
+            RATE_LIMIT_WAIT_SECONDS.count(name="test", priority="background"), 3
+        )
+
+    def test_reserved_tokens_are_kept_for_interactive_calls(self):
+        limiter = self.limiter(rate=0.1, reserved=1, max_wait=0)
+        limiter.acquire()
+        with self.assertRaises(RateLimitedError):
+            limiter.acquire()
+        self.assertLess(limiter.acquire(INTERACTIVE), 0.02)
+        with self.assertRaises(RateLimitedError):
+            limiter.acquire(INTERACTIVE)
+
+    @patch(
+        "books.services.rate_limit.get_redis_connection",
+        side_effect=ConnectionError("down"),
+    )
+    def test_redis_errors_let_calls_through(self, mock_connection):
+        limiter = self.limiter(burst=1)
+        with patch("books.services.rate_limit.time.sleep") as mock_sleep:
+            for _ in range(3):
+                limiter.acquire()
+        mock_sleep.assert_not_called()
+
+    @override_settings(GOOGLE_BOOKS_RATE_LIMIT=0)
+    def test_google_books_limiter_follows_settings(self):
+        self.assertFalse(get_google_books_limiter().enabled)
+        with override_settings(GOOGLE_BOOKS_RATE_LIMIT=5):
+            self.assertEqual(get_google_books_limiter().rate, 5)
+
+    async def test_async_acquire(self):
+        limiter = self.limiter(burst=1)
+        self.assertLess(await limiter.aacquire(), 0.02)
+        self.assertGreater(await limiter.aacquire(), 0.04)
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_refresh_runs_with_interactive_priority(self, mock_get_book_info):
+        priorities = []
+        mock_get_book_info.side_effect = lambda isbn: priorities.append(
+            current_priority()
+        )
+        user = User.objects.create_user(username="testuser", password="testpass123")
+        book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.client.force_authenticate(user=user)
+        self.client.post(reverse("book-refresh-enriched-data", args=[book.id]))
+
+        self.assertEqual(priorities, [INTERACTIVE])
+        self.assertEqual(current_priority(), "background")
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            "reads": "3/min",
+            "writes": "2/min",
+            "refreshes": "1/min",
+        },
+    }
+)
+class ThrottleTests(APITestCase):
+    """Runs against the Redis cache configured in the settings."""
+
+    def setUp(self):
+        REGISTRY.reset()
+        redis = get_redis_connection("default")
+        for key in redis.scan_iter("throttle:*"):
+            redis.delete(key)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+        self.list_url = reverse("book-list")
+
+    def test_reads_are_throttled_per_user(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.list_url).status_code, 200)
+        response = self.client.get(reverse("book-detail", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertEqual(THROTTLED_REQUESTS.value(scope="reads"), 1)
+
+        # Writes are counted separately, and so are other users
+        response = self.client.delete(reverse("book-detail", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        other = User.objects.create_user(username="other", password="testpass123")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(self.list_url).status_code, 200)
+
+    @patch("books.services.enrichment.BookEnrichmentService.get_book_info")
+    def test_refreshes_have_their_own_scope(self, mock_get_book_info):
+        mock_get_book_info.return_value = MOCK_BOOK_API_RESPONSE["items"][0][
+            "volumeInfo"
+        ]
+        url = reverse("book-refresh-enriched-data", args=[self.book.id])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(mock_get_book_info.call_count, 1)
+        self.assertEqual(self.client.get(self.list_url).status_code, 200)
+
+    @patch(
+        "books.api.throttling.get_redis_connection",
+        side_effect=ConnectionError("down"),
+    )
+    def test_redis_errors_let_requests_through(self, mock_connection):
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.list_url).status_code, 200)
+
+    async def test_async_views_are_throttled(self):
+        token = await sync_to_async(RefreshToken.for_user)(self.user)
+        headers = {"Authorization": f"Bearer {token.access_token}"}
+        url = reverse("async-book-list")
+        for _ in range(3):
+            response = await self.async_client.get(url, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+
+@override_settings(PROFILING_SERVER_TIMING=True)
+class RequestProfilingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.book = Book.objects.create(
+            title="The Hobbit",
+            author="J.R.R. Tolkien",
+            isbn="9780261102217",
+            published_date=date(1937, 9, 21),
+        )
+
+    def timings(self, response):
+        """Parses Server-Timing into {name: (description, duration)}."""
+        timings = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, *params = metric.split(";")
+            params = dict(param.split("=", 1) for param in params)
+            timings[name] = (params.get("desc", "").strip('"'), float(params["dur"]))
+        return timings
+
+    def test_server_timing_and_log_line(self):
+        with (
+            CaptureQueriesContext(connection) as queries,
+            self.assertLogs("books.requests", "INFO") as logs,
+        ):
+            response = self.client.get(reverse("book-list"))
+
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {"total", "sql", "cache", "http"})
+        self.assertEqual(timings["sql"][0], f"{len(queries)} calls")
+        self.assertNotEqual(timings["cache"][0], "0 calls")
+        self.assertEqual(timings["http"][0], "0 calls")
+        self.assertGreaterEqual(timings["total"][1], timings["sql"][1])
+        self.assertIn("path=/api/books/ status=200", logs.output[0])
+        self.assertIn(f"sql_queries={len(queries)}", logs.output[0])
+
+    @override_settings(PROFILING_SERVER_TIMING=False, PROFILING_TOKEN="secret")
+    def test_server_timing_is_only_sent_to_authorized_requests(self):
+        response = self.client.get(reverse("book-list"))
+        self.assertNotIn("Server-Timing", response)
+
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            override_settings(PROFILING_DUMP_DIR=directory),
+        ):
+            response = self.client.get(reverse("book-list"), HTTP_X_PROFILE="secret")
+        self.assertIn("sql", self.timings(response))
+
+    @override_settings(PROFILING_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_as_warnings(self):
+        with self.assertLogs("books.requests", "WARNING") as logs:
+            self.client.get(reverse("book-list"))
+        self.assertIn("Slow request method=GET path=/api/books/", logs.output[0])
+
+    @patch("requests.Session.get")
+    def test_outbound_http_is_timed(self, mock_get):
+        mock_response = Mock()
+        mock_response.json.return_value = MOCK_BOOK_API_RESPONSE
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        response = self.client.post(
+            reverse("book-refresh-enriched-data", args=[self.book.id])
+        )
+        self.assertEqual(self.timings(response)["http"][0], "1 calls")
+
+    def test_profile_is_dumped_for_authorized_requests(self):
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            override_settings(PROFILING_TOKEN="secret", PROFILING_DUMP_DIR=directory),
+        ):
+            response = self.client.get(reverse("book-list"), HTTP_X_PROFILE="wrong")
+            self.assertNotIn("X-Profile-Dump", response)
+
+            response = self.client.get(reverse("book-list"), HTTP_X_PROFILE="secret")
+            stats = pstats.Stats(os.path.join(directory, response["X-Profile-Dump"]))
+            self.assertGreater(stats.total_calls, 0)
+
+    async def test_async_views_are_profiled(self):
+        token = await sync_to_async(RefreshToken.for_user)(self.user)
+        response = await self.async_client.get(
+            reverse("async-book-list"),
+            headers={"Authorization": f"Bearer {token.access_token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(self.timings(response)["sql"][0], "0 calls")
+
+    @override_settings(PROFILING_TOKEN="secret")
+    async def test_async_requests_are_not_run_under_cprofile(self):
+        token = await sync_to_async(RefreshToken.for_user)(self.user)
+        response = await self.async_client.get(
+            reverse("async-book-list"),
+            headers={
+                "Authorization": f"Bearer {token.access_token}",
+                "X-Profile": "secret",
+            },
+        )
+        self.assertIn("Server-Timing", response)
+        self.assertNotIn("X-Profile-Dump", response)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third party apps
     "rest_framework",
     "drf_spectacular",
@@ -46,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "books.middleware.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -96,6 +99,8 @@ CACHES = {
         "LOCATION": os.getenv("REDIS_URL", "redis://redis:6379/1"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Times Redis round trips for the request profiler
+            "CONNECTION_POOL_CLASS": "books.services.profiling.ProfiledConnectionPool",
         },
     }
 }
@@ -103,6 +108,85 @@ CACHES = {
 # Cache time to live is 24 hours
 CACHE_TTL = 60 * 60 * 24
 
+# Stale-while-revalidate: cached book data older than CACHE_SOFT_TTL is served
+# while a background refresh runs; only data older than CACHE_TTL blocks callers
+CACHE_STALE_WHILE_REVALIDATE = bool(int(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "1")))
+CACHE_SOFT_TTL = int(os.getenv("CACHE_SOFT_TTL", str(60 * 60 * 12)))
+CACHE_REVALIDATION_WORKERS = 4
+
+# Unknown ISBNs are cached for an hour, transient API failures for 30 seconds
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "3600"))
+TRANSIENT_FAILURE_TTL = int(os.getenv("TRANSIENT_FAILURE_TTL", "30"))
+
+# Lock letting a single worker fetch a missing ISBN while the others wait
+CACHE_LOCK_TIMEOUT = int(os.getenv("CACHE_LOCK_TIMEOUT", "10"))
+CACHE_LOCK_WAIT_TIMEOUT = float(os.getenv("CACHE_LOCK_WAIT_TIMEOUT", "5"))
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# In-process cache tier kept in front of Redis for enriched book data
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", "60"))
+# Redis pub/sub channel used to evict local cache entries on every worker
+CACHE_INVALIDATION_CHANNEL = "books:cache:invalidate"
+
+# Seconds authenticated users are cached instead of loaded on every request
+# (0 disables the user cache). Saving or deleting a user invalidates its entry
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+
+# Seconds list and detail responses are cached (0 disables the response cache).
+# Entries are keyed by the collection version, so writes invalidate them at once
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+# Autocomplete suggestions
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
+AUTOCOMPLETE_CACHE_TTL = int(os.getenv("AUTOCOMPLETE_CACHE_TTL", "300"))
+
+# Bulk book upserts: items accepted per request and rows per INSERT
+BOOKS_BULK_MAX_ITEMS = int(os.getenv("BOOKS_BULK_MAX_ITEMS", "5000"))
+BOOKS_BULK_BATCH_SIZE = 500
+# Rows fetched per round trip by catalog exports
+BOOKS_EXPORT_CHUNK_SIZE = 2000
+# Keys accepted per batch retrieval request
+BOOKS_BATCH_MAX_KEYS = int(os.getenv("BOOKS_BATCH_MAX_KEYS", "200"))
+
+# Keep-alive connections kept per host for Google Books requests
+GOOGLE_BOOKS_POOL_SIZE = int(os.getenv("GOOGLE_BOOKS_POOL_SIZE", "20"))
+# Connections kept per event loop by the async client (concurrent requests in flight)
+GOOGLE_BOOKS_ASYNC_POOL_SIZE = int(os.getenv("GOOGLE_BOOKS_ASYNC_POOL_SIZE", "100"))
+# Seconds to wait for a connection and for each read from Google Books
+GOOGLE_BOOKS_CONNECT_TIMEOUT = float(os.getenv("GOOGLE_BOOKS_CONNECT_TIMEOUT", "3.05"))
+GOOGLE_BOOKS_READ_TIMEOUT = float(os.getenv("GOOGLE_BOOKS_READ_TIMEOUT", "10"))
+# Retries of a failed Google Books request, with jittered exponential backoff
+# starting at BASE_DELAY seconds and capped at MAX_DELAY seconds
+GOOGLE_BOOKS_MAX_RETRIES = int(os.getenv("GOOGLE_BOOKS_MAX_RETRIES", "2"))
+GOOGLE_BOOKS_RETRY_BASE_DELAY = float(os.getenv("GOOGLE_BOOKS_RETRY_BASE_DELAY", "0.1"))
+GOOGLE_BOOKS_RETRY_MAX_DELAY = float(os.getenv("GOOGLE_BOOKS_RETRY_MAX_DELAY", "2"))
+# Google Books calls per second allowed across all workers (0 disables the
+# limiter), with bursts up to BURST. The last RESERVED tokens are kept for
+# interactive refreshes; callers give up after MAX_WAIT seconds
+GOOGLE_BOOKS_RATE_LIMIT = float(os.getenv("GOOGLE_BOOKS_RATE_LIMIT", "10"))
+GOOGLE_BOOKS_RATE_LIMIT_BURST = int(os.getenv("GOOGLE_BOOKS_RATE_LIMIT_BURST", "20"))
+GOOGLE_BOOKS_RATE_LIMIT_RESERVED = int(
+    os.getenv("GOOGLE_BOOKS_RATE_LIMIT_RESERVED", "5")
+)
+GOOGLE_BOOKS_RATE_LIMIT_MAX_WAIT = float(
+    os.getenv("GOOGLE_BOOKS_RATE_LIMIT_MAX_WAIT", "30")
+)
+# Circuit breaker: after this many failed lookups within the window (seconds),
+# lookups fail fast for the recovery time (seconds) before Google Books is probed
+GOOGLE_BOOKS_BREAKER_FAILURES = int(os.getenv("GOOGLE_BOOKS_BREAKER_FAILURES", "5"))
+GOOGLE_BOOKS_BREAKER_WINDOW = int(os.getenv("GOOGLE_BOOKS_BREAKER_WINDOW", "60"))
+GOOGLE_BOOKS_BREAKER_RECOVERY = int(os.getenv("GOOGLE_BOOKS_BREAKER_RECOVERY", "30"))
+
+# Background enrichment queue
+ENRICHMENT_JOB_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_JOB_MAX_ATTEMPTS", "5"))
+# Seconds to wait before retrying, multiplied by the attempt number
+ENRICHMENT_JOB_RETRY_DELAY = int(os.getenv("ENRICHMENT_JOB_RETRY_DELAY", "60"))
+# Seconds after which a job claimed by a dead worker can be claimed again
+ENRICHMENT_JOB_LEASE = int(os.getenv("ENRICHMENT_JOB_LEASE", "300"))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -149,12 +233,25 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "books.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "books.api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Requests per client and scope: reads, writes and enrichment refreshes
+    "DEFAULT_THROTTLE_CLASSES": [
+        "books.api.throttling.ScopedSlidingWindowThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "reads": os.getenv("THROTTLE_READS", "1200/min"),
+        "writes": os.getenv("THROTTLE_WRITES", "300/min"),
+        "refreshes": os.getenv("THROTTLE_REFRESHES", "30/min"),
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -174,6 +271,16 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
+# Request profiling: requests slower than PROFILING_SLOW_REQUEST_MS are logged
+# as warnings. Requests sent with an `X-Profile` header equal to PROFILING_TOKEN
+# (disabled when empty) get a Server-Timing header (all requests do with
+# PROFILING_SERVER_TIMING) and are run under cProfile, with the stats written
+# to PROFILING_DUMP_DIR
+PROFILING_SLOW_REQUEST_MS = int(os.getenv("PROFILING_SLOW_REQUEST_MS", "1000"))
+PROFILING_SERVER_TIMING = bool(int(os.getenv("PROFILING_SERVER_TIMING", "0")))
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_DUMP_DIR = os.getenv("PROFILING_DUMP_DIR", tempfile.gettempdir())
+
 # Logging configuration
 LOGGING = {
     "version": 1,